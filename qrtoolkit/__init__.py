@@ -1,2 +1,8 @@
 __version__ = "0.1.0"
-from .cli import main
+
+
+def main():
+    # Imported on call so `import qrtoolkit` stays cheap for the console script
+    from .cli import main as cli_main
+
+    return cli_main()
@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+from collections import Counter
+
+from ..core.processor import DataProcessor, PayloadClassifier
+
+# One template per kind, plus payloads that look close but are plain text
+TEMPLATES = (
+    "https://example{i}.com/path/{i}?q={i}",
+    "http://192.168.{a}.{b}:8080/",
+    "otpauth://totp/Service{i}:user{i}@example.com?secret=JBSWY3DPEHPK3PXP&issuer=Service{i}",
+    "otpauth-migration://offline?data=CjkKFKxMCcKCBufjVZSqazQv{i}",
+    "WIFI:T:WPA;S:network{i};P:password{i};;",
+    "BEGIN:VCARD\nVERSION:3.0\nFN:Person {i}\nTEL:+1555{i}\nEND:VCARD",
+    "MECARD:N:Person {i};TEL:+1555{i};;",
+    "mailto:user{i}@example.com?subject=hello",
+    "geo:{a}.{b},-{b}.{a}",
+    "SMSTO:+1555{i}:message {i}",
+    "Plain text payload number {i}",
+    "1234567890{i}",
+    "https://not a url {i}",
+)
+
+
+def synthetic_payloads(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(i=i, a=rng.randrange(256), b=rng.randrange(256))
+        for i in range(count)
+    ]
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool bench classify",
+        description="Throughput of payload classification",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1_000_000,
+        help="Payloads to classify (default: 1000000)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Passes, best is kept (default: 3)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    args = parser.parse_args(argv)
+
+    payloads = synthetic_payloads(args.count, args.seed)
+    classify = PayloadClassifier().classify
+
+    seconds = best_of(args.repeat, lambda: [classify(data) for data in payloads])
+    print(f"{'payloads':>24}  {args.count:8d}")
+    print(f"{'classify':>24}  {seconds * 1e9 / args.count:8.1f} ns/payload")
+    print(f"{'payloads/s':>24}  {args.count / seconds:8.0f}")
+
+    # Outputs read the kind cached on the result after the first lookup
+    results = [{"data": data} for data in payloads]
+    first = best_of(1, lambda: [DataProcessor.result_kind(r) for r in results])
+    cached = best_of(
+        args.repeat, lambda: [DataProcessor.result_kind(r) for r in results]
+    )
+    print(f"{'result_kind (first)':>24}  {first * 1e9 / args.count:8.1f} ns/payload")
+    print(f"{'result_kind (cached)':>24}  {cached * 1e9 / args.count:8.1f} ns/payload")
+
+    kinds = Counter(result["kind"] for result in results)
+    for kind in PayloadClassifier.KINDS:
+        print(f"{kind:>24}  {kinds[kind]:8d}")
+    return 0
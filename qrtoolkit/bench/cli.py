@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import sys
+
+from .corpus import MANIFEST, CorpusGenerator
+from .runner import DECODE_PATHS, BenchmarkRunner
+from ..utils.colors import foreground
+from ..utils.loger import get_logger
+
+logger = get_logger()
+
+fg = foreground()
+RESET = fg.RESET
+
+COLUMNS = (
+    ("path", "Path", "{}"),
+    ("images_per_s", "img/s", "{:.1f}"),
+    ("p50_ms", "p50 ms", "{:.2f}"),
+    ("p95_ms", "p95 ms", "{:.2f}"),
+    ("p99_ms", "p99 ms", "{:.2f}"),
+    ("peak_rss_mb", "RSS MB", "{:.0f}"),
+    ("hit_rate", "hit %", "{:.1%}"),
+)
+
+
+def print_table(report):
+    print("  ".join(f"{title:>10}" for _, title, _ in COLUMNS))
+    for result in report["results"]:
+        if "error" in result:
+            print(f"{result['path']:>10}  {fg.RED_FG}{result['error']}{RESET}")
+            continue
+        print(
+            "  ".join(
+                f"{'-' if result[key] is None else fmt.format(result[key]):>10}"
+                for key, _, fmt in COLUMNS
+            )
+        )
+
+
+def compare(report, baseline):
+    """Print the relative change of each path against a previous run"""
+    previous = {result["path"]: result for result in baseline["results"]}
+    for result in report["results"]:
+        before = previous.get(result["path"])
+        if not before or "error" in result or "error" in before:
+            continue
+        changes = []
+        for key in ("images_per_s", "p95_ms", "hit_rate"):
+            if result[key] is None or not before[key]:
+                continue
+            delta = (result[key] - before[key]) / before[key]
+            # Throughput and hit rate should go up, latency down
+            better = delta >= 0 if key != "p95_ms" else delta <= 0
+            color = fg.GREEN_FG if better else fg.RED_FG
+            changes.append(f"{key} {color}{delta:+.1%}{RESET}")
+        print(f"{result['path']:>10}  " + ", ".join(changes))
+
+
+def startup(argv):
+    from .startup import main as startup_main
+
+    return startup_main(argv)
+
+
+def migration(argv):
+    from .migration import main as migration_main
+
+    return migration_main(argv)
+
+
+def classify(argv):
+    from .classify import main as classify_main
+
+    return classify_main(argv)
+
+
+# Benchmark suites other than the default decode suite
+SUITES = {
+    "startup": startup,
+    "migration": migration,
+    "classify": classify,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUITES:
+        return SUITES[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        prog="qrtool bench",
+        description="Reproducible QR decode benchmarks "
+        f"(other suites: {', '.join(SUITES)})",
+    )
+    parser.add_argument("--corpus", default="qr_bench_corpus", help="Corpus directory")
+    parser.add_argument(
+        "--count", type=int, default=120, help="Images to generate (default: 120)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Corpus generator seed (default: 0)"
+    )
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="Rebuild the corpus even if it already exists",
+    )
+    parser.add_argument(
+        "--paths",
+        default=",".join(DECODE_PATHS),
+        help=f"Comma-separated decode paths ({', '.join(DECODE_PATHS)})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Passes over the corpus per path"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Workers for the batch path (default: CPUs)"
+    )
+    parser.add_argument("-o", "--output", help="Write the JSON report to a file")
+    parser.add_argument(
+        "--compare", metavar="REPORT", help="Compare against a previous JSON report"
+    )
+    args = parser.parse_args(argv)
+
+    paths = [name for name in args.paths.split(",") if name]
+    unknown = [name for name in paths if name not in DECODE_PATHS]
+    if unknown:
+        parser.error(f"Unknown decode path(s): {', '.join(unknown)}")
+
+    manifest = os.path.join(args.corpus, MANIFEST)
+    if args.regenerate or not os.path.exists(manifest):
+        logger.info(
+            f"Generating {args.count} images (seed {args.seed}) in "
+            f"{fg.BLUE_FG}{args.corpus}{RESET}"
+        )
+        CorpusGenerator(args.corpus, count=args.count, seed=args.seed).generate()
+
+    report = BenchmarkRunner(
+        args.corpus, paths=paths, repeat=args.repeat, workers=args.workers
+    ).run()
+    print_table(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report saved to: {fg.BLUE_FG}{args.output}{RESET}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
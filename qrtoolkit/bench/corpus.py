@@ -0,0 +1,124 @@
+import json
+import os
+import random
+import string
+
+import cv2
+import numpy as np
+
+MANIFEST = "manifest.json"
+
+
+class CorpusGenerator:
+    """
+    Build a deterministic, offline QR corpus with cv2.QRCodeEncoder.
+    The same seed and count always produce the same images and manifest.
+    """
+
+    PAYLOAD_SIZES = (16, 64, 256, 1024)
+    MODULE_PIXELS = (2, 4, 8)
+    DISTORTIONS = ("clean", "noise", "blur", "rotate", "scale", "multi")
+    ALPHABET = string.ascii_letters + string.digits + "-._~:/?#&="
+
+    def __init__(self, directory, count=120, seed=0):
+        self.directory = directory
+        self.count = count
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        self.encoder = cv2.QRCodeEncoder.create()
+
+    def payload(self, size):
+        return "".join(self.random.choice(self.ALPHABET) for _ in range(size))
+
+    def symbol(self, payload, module_px):
+        """Encode a payload and scale it so one module is module_px pixels"""
+        image = self.encoder.encode(payload)
+        return cv2.resize(
+            image, None, fx=module_px, fy=module_px, interpolation=cv2.INTER_NEAREST
+        )
+
+    def place(self, symbol):
+        """Drop a symbol at a random offset on a white canvas"""
+        height, width = symbol.shape
+        canvas = np.full((height * 2, width * 2), 255, np.uint8)
+        top = self.random.randrange(height)
+        left = self.random.randrange(width)
+        canvas[top : top + height, left : left + width] = symbol
+        return canvas
+
+    def distort(self, image, distortion):
+        if distortion == "noise":
+            noise = self.rng.normal(0, 12, image.shape)
+            return np.clip(image + noise, 0, 255).astype(np.uint8)
+        if distortion == "blur":
+            return cv2.GaussianBlur(image, (5, 5), self.random.uniform(0.6, 1.2))
+        if distortion == "rotate":
+            height, width = image.shape
+            matrix = cv2.getRotationMatrix2D(
+                (width / 2, height / 2), self.random.uniform(5, 40), 1.0
+            )
+            return cv2.warpAffine(image, matrix, (width, height), borderValue=255)
+        if distortion == "scale":
+            factor = self.random.uniform(0.6, 1.6)
+            return cv2.resize(
+                image, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA
+            )
+        return image
+
+    def multi(self, module_px):
+        """Several codes laid out side by side on one canvas"""
+        payloads = [
+            self.payload(self.random.choice(self.PAYLOAD_SIZES[:2]))
+            for _ in range(self.random.randint(2, 4))
+        ]
+        symbols = [self.symbol(payload, module_px) for payload in payloads]
+        size = max(symbol.shape[0] for symbol in symbols)
+        gap = size // 2
+        canvas = np.full(
+            (size + 2 * gap, len(symbols) * (size + gap) + gap), 255, np.uint8
+        )
+        for i, symbol in enumerate(symbols):
+            left = gap + i * (size + gap)
+            canvas[gap : gap + symbol.shape[0], left : left + symbol.shape[1]] = symbol
+        return canvas, payloads
+
+    def generate(self):
+        """Write the corpus images and manifest, returning the manifest"""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for i in range(self.count):
+            distortion = self.DISTORTIONS[i % len(self.DISTORTIONS)]
+            module_px = self.random.choice(self.MODULE_PIXELS)
+
+            if distortion == "multi":
+                image, payloads = self.multi(module_px)
+                payload_size = max(len(payload) for payload in payloads)
+            else:
+                payload_size = self.random.choice(self.PAYLOAD_SIZES)
+                payloads = [self.payload(payload_size)]
+                image = self.distort(
+                    self.place(self.symbol(payloads[0], module_px)), distortion
+                )
+
+            name = f"{i:05d}_{distortion}_{payload_size}b_{module_px}px.png"
+            cv2.imwrite(os.path.join(self.directory, name), image)
+            entries.append(
+                {
+                    "file": name,
+                    "payloads": payloads,
+                    "distortion": distortion,
+                    "payload_size": payload_size,
+                    "module_px": module_px,
+                }
+            )
+
+        manifest = {"seed": self.seed, "count": self.count, "images": entries}
+        with open(os.path.join(self.directory, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
@@ -0,0 +1,168 @@
+import argparse
+import base64
+import random
+import time
+import urllib.parse
+
+from ..core.migration import MIGRATION_PREFIX, iter_migration_url
+from ..utils.colors import foreground
+from ..utils.loger import get_logger
+
+logger = get_logger()
+
+fg = foreground()
+RESET = fg.RESET
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number, value):
+    """Encode one varint (int) or length-delimited (bytes) protobuf field"""
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def encode_migration_url(accounts, batch_size=1, batch_index=0, batch_id=0):
+    """Build an otpauth-migration URL like an authenticator's export screen"""
+    payload = b""
+    for account in accounts:
+        payload += _field(
+            1,
+            _field(1, account["secret"])
+            + _field(2, account["name"].encode("utf-8"))
+            + _field(3, account["issuer"].encode("utf-8"))
+            + _field(4, account["algorithm"])
+            + _field(5, account["digits"])
+            + _field(6, account["type"]),
+        )
+    payload += (
+        _field(2, 1)
+        + _field(3, batch_size)
+        + _field(4, batch_index)
+        + _field(5, batch_id)
+    )
+    data = urllib.parse.quote(base64.b64encode(payload).decode("ascii"), safe="")
+    return f"{MIGRATION_PREFIX}offline?data={data}"
+
+
+def synthetic_export(accounts, per_qr, seed=0):
+    """Split a synthetic account list into multi-QR export batches"""
+    rng = random.Random(seed)
+    people = [
+        {
+            "secret": rng.randbytes(rng.choice((10, 20, 32))),
+            "name": f"user{i}@example.com",
+            "issuer": f"Service{i % 97}",
+            "algorithm": rng.choice((1, 1, 1, 2, 3)),
+            "digits": rng.choice((1, 1, 2)),
+            "type": rng.choice((2, 2, 2, 1)),
+        }
+        for i in range(accounts)
+    ]
+    batches = [people[i : i + per_qr] for i in range(0, accounts, per_qr)]
+    batch_id = rng.randrange(1 << 31)
+    return [
+        encode_migration_url(batch, len(batches), index, batch_id)
+        for index, batch in enumerate(batches)
+    ]
+
+
+def time_parse(urls, repeat):
+    """Best wall time in seconds to expand every URL into entries"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = sum(1 for url in urls for _ in iter_migration_url(url))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def time_decode(urls, limit):
+    """Render up to limit batches as QR codes and decode them end to end"""
+    import cv2
+
+    from ..core.decoder import QRDecoder
+    from ..core.processor import DataProcessor
+
+    encoder = cv2.QRCodeEncoder.create()
+    decoder = QRDecoder()
+    images = [
+        # Four-module white quiet zone, the encoder output has none
+        cv2.copyMakeBorder(
+            cv2.resize(
+                encoder.encode(url), None, fx=3, fy=3, interpolation=cv2.INTER_NEAREST
+            ),
+            *(12,) * 4,
+            cv2.BORDER_CONSTANT,
+            value=255,
+        )
+        for url in urls[:limit]
+    ]
+    started = time.perf_counter()
+    found = count = 0
+    for image in images:
+        for result in decoder.decode_from_array(image):
+            found += 1
+            count += sum(1 for _ in DataProcessor.parse_2fa_entries(result["data"]))
+    return time.perf_counter() - started, len(images), found, count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool bench migration",
+        description="Throughput of expanding otpauth-migration batch exports",
+    )
+    parser.add_argument(
+        "--accounts",
+        type=int,
+        default=100_000,
+        help="Accounts in the synthetic export (default: 100000)",
+    )
+    parser.add_argument(
+        "--per-qr", type=int, default=10, help="Accounts per QR batch (default: 10)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Parse passes, best is kept (default: 3)"
+    )
+    parser.add_argument(
+        "--decode",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Also render and decode N batches as QR images",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    args = parser.parse_args(argv)
+
+    urls = synthetic_export(args.accounts, args.per_qr, args.seed)
+    seconds, count = time_parse(urls, args.repeat)
+    print(f"{'batches':>24}  {len(urls):8d}")
+    print(f"{'accounts':>24}  {count:8d}")
+    print(f"{'parse':>24}  {seconds * 1000:8.1f} ms")
+    print(f"{'accounts/s':>24}  {count / seconds:8.0f}")
+    print(f"{'us/batch':>24}  {seconds / len(urls) * 1e6:8.1f}")
+
+    failed = count != args.accounts
+    if args.decode:
+        seconds, images, found, decoded = time_decode(urls, args.decode)
+        print(f"{'decode + expand':>24}  {seconds / images * 1000:8.1f} ms/QR")
+        print(f"{'QR decoded':>24}  {found:4d}/{images:<3d}")
+        print(f"{'accounts from QR':>24}  {decoded:8d}")
+
+    if failed:
+        logger.error(
+            f"{fg.RED_FG}Expanded account count does not match the export{RESET}"
+        )
+    return 1 if failed else 0
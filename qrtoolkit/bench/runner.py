@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .corpus import load_manifest
+from ..utils.stats import percentile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Decode paths exercised by the benchmark: decoder options plus batch workers
+DECODE_PATHS = {
+    "image": {"decoder": {}},
+    "pyramid": {"decoder": {"pyramid": (4, 2)}},
+    "opencv": {"decoder": {"backends": ("opencv",)}},
+    "cascade": {"decoder": {"backends": ("pyzbar", "opencv")}},
+    "batch": {"decoder": {}, "batch": True},
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished children"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_path(name, spec, directory, images, repeat, workers):
+    """Run one decode path in a fresh process so its peak RSS is its own"""
+    from ..core.batch import BatchDecoder
+    from ..core.decoder import QRDecoder
+
+    paths = [os.path.join(directory, image["file"]) for image in images]
+    expected = sum(len(image["payloads"]) for image in images)
+    latencies = []
+    found = 0
+    errors = 0
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if spec.get("batch"):
+            # One item per file, so results line up with the manifest
+            batch = BatchDecoder(
+                workers=workers,
+                decoder_options=spec["decoder"],
+                split_documents=False,
+            )
+            decoded = []
+            for _, results, error, seconds in batch.decode(paths, len(paths)):
+                # Per-file decode time inside the worker, without queueing
+                decoded.append((results, error))
+                latencies.append(seconds)
+        else:
+            decoder = QRDecoder(**spec["decoder"])
+            decoded = []
+            for path in paths:
+                t0 = time.perf_counter()
+                try:
+                    decoded.append((decoder.decode_from_image(path), None))
+                except Exception as e:
+                    decoded.append(([], str(e)))
+                latencies.append(time.perf_counter() - t0)
+
+        for image, (results, error) in zip(images, decoded):
+            errors += bool(error)
+            data = {result["data"] for result in results}
+            found += sum(payload in data for payload in image["payloads"])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(paths) * repeat
+    return {
+        "path": name,
+        "images": total,
+        "seconds": elapsed,
+        "images_per_s": total / elapsed if elapsed else None,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "peak_rss_mb": peak_rss_mb(),
+        "hit_rate": found / (expected * repeat) if expected else None,
+        "errors": errors,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+class BenchmarkRunner:
+    """Run decode paths against a generated corpus and collect comparable numbers"""
+
+    def __init__(self, directory, paths=tuple(DECODE_PATHS), repeat=1, workers=None):
+        self.directory = directory
+        self.paths = paths
+        self.repeat = repeat
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest = load_manifest(directory)
+
+    def environment(self):
+        import cv2
+
+        return {
+            "generated": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "cpus": os.cpu_count(),
+            "workers": self.workers,
+            "corpus_seed": self.manifest["seed"],
+            "corpus_count": self.manifest["count"],
+            "repeat": self.repeat,
+        }
+
+    def run(self):
+        images = self.manifest["images"]
+        results = []
+        for name in self.paths:
+            # Spawned, not forked, so the parent's memory does not count
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                future = pool.submit(
+                    _run_path,
+                    name,
+                    DECODE_PATHS[name],
+                    self.directory,
+                    images,
+                    self.repeat,
+                    self.workers,
+                )
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({"path": name, "error": str(e)})
+        return {"environment": self.environment(), "results": results}
@@ -0,0 +1,101 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from ..utils.colors import foreground
+from ..utils.loger import get_logger
+
+logger = get_logger()
+
+fg = foreground()
+RESET = fg.RESET
+
+# Modules that must not be loaded just to parse arguments
+HEAVY_MODULES = (
+    "cv2",
+    "numpy",
+    "pyzbar",
+    "matplotlib",
+    "tqdm",
+    "asyncio",
+    "webbrowser",
+)
+
+LAUNCHER = (
+    "import sys; from qrtoolkit import main; sys.argv[0] = 'qrtool'; sys.exit(main())"
+)
+
+IMPORT_PROBE = (
+    "import sys, qrtoolkit.cli; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+
+def eager_imports():
+    """Heavy modules pulled in by importing the CLI"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(modules=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return [module for module in output.split(",") if module]
+
+
+def time_command(command, runs):
+    """Median wall time in ms of running command"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def time_qrtool(argv, runs):
+    return time_command([sys.executable, "-c", LAUNCHER, *argv], runs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool bench startup",
+        description="Startup-time regression check for the qrtool command",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Launches per case (default: 10)"
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=300.0,
+        help="Fail if `qrtool --help` takes longer (default: 300)",
+    )
+    parser.add_argument("--image", help="Also time a single-image decode of this file")
+    args = parser.parse_args(argv)
+
+    failed = False
+    loaded = eager_imports()
+    if loaded:
+        failed = True
+        logger.error(
+            f"{fg.RED_FG}Importing qrtoolkit.cli loads: {', '.join(loaded)}{RESET}"
+        )
+
+    # Bare interpreter startup, for scale
+    python_ms = time_command([sys.executable, "-c", "pass"], args.runs)
+    help_ms = time_qrtool(["--help"], args.runs)
+    print(f"{'python -c pass':>24}  {python_ms:8.1f} ms")
+    print(f"{'qrtool --help':>24}  {help_ms:8.1f} ms")
+    if args.image:
+        image_ms = time_qrtool([args.image, "--quiet"], args.runs)
+        print(f"{'qrtool IMAGE':>24}  {image_ms:8.1f} ms")
+
+    if help_ms > args.max_ms:
+        failed = True
+        logger.error(
+            f"{fg.RED_FG}qrtool --help took {help_ms:.1f} ms, "
+            f"budget is {args.max_ms:.1f} ms{RESET}"
+        )
+    return 1 if failed else 0
@@ -1,18 +1,23 @@
 import argparse
 import sys
 import os
-import asyncio
-from tqdm.asyncio import tqdm
+import time
+from collections import Counter
 from datetime import datetime
-from .core.decoder import QRDecoder
+from .core.backends import BACKENDS
 from .core.processor import DataProcessor
+from .input.documents import DocumentReader
+from .input.scanner import DirectoryScanner
 from .outputs.json_handler import JSONHandler
-from .outputs.url_handler import URLHandler
 from .outputs.text_handler import TextHandler
 
+# Heavy modules (cv2, pyzbar, tqdm, matplotlib, webbrowser) are imported on
+# the code path that needs them so `--help` and single-file runs start fast
+
 # from .utils.Execptions import QRToolException
 from .utils.colors import foreground
 from .utils.loger import get_logger
+from .utils.profiler import PROFILER
 
 logger = get_logger()
 
@@ -20,18 +25,101 @@ fg = foreground()
 RESET = fg.RESET
 
 
-def main():
+def bench(argv):
+    from .bench.cli import main as bench_main
+
+    return bench_main(argv)
+
+
+def serve(argv):
+    from .service.server import main as serve_main
+
+    return serve_main(argv)
+
+
+def client(argv):
+    from .service.client import main as client_main
+
+    return client_main(argv)
+
+
+def query(argv):
+    from .outputs.store import main as query_main
+
+    return query_main(argv)
+
+
+def watch(argv):
+    # `qrtool watch DIR [options]` is `qrtool --watch DIR [options]`
+    return main(["--watch", *argv])
+
+
+# Sub-commands dispatched on the first argument, unless it names a file
+COMMANDS = {
+    "bench": bench,
+    "serve": serve,
+    "client": client,
+    "query": query,
+    "watch": watch,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS and not os.path.exists(argv[0]):
+        return COMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(description="QR Code Processing Toolkit")
 
     # Input options
     input_group = parser.add_argument_group("Input Options")
-    input_group.add_argument("inputs", nargs="*", help="Input image files")
+    input_group.add_argument(
+        "inputs",
+        nargs="*",
+        help="Input image files, PDFs, multi-page TIFFs or GIFs ('-' reads stdin)",
+    )
     input_group.add_argument("-d", "--directory", help="Directory to scan for images")
+    input_group.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Descend into subdirectories of --directory",
+    )
+    input_group.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Only scan files matching GLOB (repeatable)",
+    )
+    input_group.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="Skip files and directories matching GLOB (repeatable)",
+    )
+    input_group.add_argument(
+        "--sniff",
+        action="store_true",
+        help="Detect images by content instead of file extension",
+    )
     input_group.add_argument(
         "-c", "--camera", action="store_true", help="Use camera to scan QR code"
     )
     input_group.add_argument(
-        "-s", "--screenshot", action="store_true", help="Capture screenshot"
+        "-s",
+        "--screenshot",
+        action="store_true",
+        help="Scan the screen until a QR code shows up (or continuously with --stream)",
+    )
+    input_group.add_argument(
+        "--video", metavar="FILE", help="Scan a recorded video file for QR codes"
+    )
+    input_group.add_argument(
+        "--watch",
+        nargs="?",
+        const=True,
+        metavar="DIR",
+        help="Keep decoding images as they are written to DIR (or --directory)",
     )
 
     # Output options
@@ -46,6 +134,20 @@ def main():
     output_group.add_argument(
         "-u", "--open-url", action="store_true", help="Auto-open URLs"
     )
+    output_group.add_argument(
+        "--ndjson",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Stream one JSON record per code as it is decoded (default: stdout)",
+    )
+    output_group.add_argument(
+        "--store",
+        nargs="?",
+        const="",
+        metavar="DB",
+        help="Index decoded payloads in a SQLite store searchable with `qrtool query`",
+    )
     output_group.add_argument("--copy", action="store_true", help="Copy to clipboard")
     output_group.add_argument(
         "--quiet", action="store_true", help="Suppress console output"
@@ -60,33 +162,293 @@ def main():
         "--batch", action="store_true", help="Process multiple files"
     )
     process_group.add_argument(
-        "--timeout", type=int, default=30, help="Camera timeout in seconds"
+        "--timeout", type=int, default=30, help="Camera or screen timeout in seconds"
     )
 
     process_group.add_argument(
         "--stream",
         action="store_true",
-        help="Keep reading from camera until terminated.",
+        help="Keep reading from camera or screen until terminated.",
+    )
+    process_group.add_argument(
+        "--screen-rate",
+        type=float,
+        default=2.0,
+        metavar="FPS",
+        help="Screen captures per second, only changed regions are decoded (default: 2)",
+    )
+    process_group.add_argument(
+        "--source",
+        default="0",
+        help="Camera index or video file to use as the camera (default: 0)",
+    )
+    process_group.add_argument(
+        "--no-display",
+        action="store_true",
+        help="Scan the camera feed without opening a preview window",
+    )
+    process_group.add_argument(
+        "--roi",
+        action="store_true",
+        help="Decode only around the last detection between full-frame scans",
+    )
+    process_group.add_argument(
+        "--roi-padding",
+        type=float,
+        default=0.5,
+        help="Crop padding as a fraction of the detection size (default: 0.5)",
+    )
+    process_group.add_argument(
+        "--full-scan-every",
+        type=int,
+        default=30,
+        help="Frames between full-frame scans while tracking (default: 30)",
+    )
+    process_group.add_argument(
+        "--skip-static",
+        action="store_true",
+        help="Skip decoding camera frames that have not changed",
     )
+    process_group.add_argument(
+        "--change-threshold",
+        type=float,
+        default=2.0,
+        help="Mean pixel difference (0-255) that counts as a change (default: 2.0)",
+    )
+    process_group.add_argument(
+        "--max-skip",
+        type=int,
+        default=0,
+        help="Decode anyway after N skipped frames in a row (default: 0, never)",
+    )
+    process_group.add_argument(
+        "--dpi",
+        type=int,
+        default=150,
+        help="Resolution PDF pages are rasterized at (default: 150)",
+    )
+    process_group.add_argument(
+        "--sample-fps",
+        type=float,
+        default=2.0,
+        help="Video frames decoded per second of footage (default: 2, 0 = every frame)",
+    )
+    process_group.add_argument(
+        "--keyframes",
+        action="store_true",
+        help="Decode only video key frames (requires PyAV)",
+    )
+    process_group.add_argument(
+        "--backend",
+        default="pyzbar",
+        metavar="NAMES",
+        help=f"Comma-separated decoder backends to cascade ({', '.join(BACKENDS)}, default: pyzbar)",
+    )
+    process_group.add_argument(
+        "--fixed-order",
+        action="store_true",
+        help="Try backends in the given order instead of fastest-first",
+    )
+    process_group.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Decode files in N worker processes (0 = one per CPU)",
+    )
+    process_group.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Decode files on an asyncio event loop, reporting them as they complete",
+    )
+    process_group.add_argument(
+        "--concurrency",
+        type=int,
+        help="Decodes in flight with --async (default: one per CPU)",
+    )
+    process_group.add_argument(
+        "--chunksize",
+        type=int,
+        help="Files sent to a worker per task (default: automatic)",
+    )
+    process_group.add_argument(
+        "--pyramid",
+        nargs="?",
+        const="4,2",
+        metavar="LEVELS",
+        help="Try reduced grayscale reads first, e.g. 8,4,2 (default: 4,2)",
+    )
+    process_group.add_argument(
+        "--tile",
+        nargs="?",
+        type=int,
+        const=2048,
+        metavar="SIZE",
+        help="Decode images larger than SIZE pixels as overlapping tiles (default: 2048)",
+    )
+    process_group.add_argument(
+        "--tile-overlap",
+        type=int,
+        default=256,
+        help="Pixels shared by neighbouring tiles, at least the largest code size (default: 256)",
+    )
+    process_group.add_argument(
+        "--locate",
+        nargs="?",
+        type=int,
+        const=1600,
+        metavar="SIZE",
+        help="Locate codes on a copy downscaled to SIZE pixels and decode only "
+        "rectified crops around them (default: 1600)",
+    )
+    process_group.add_argument(
+        "--locate-padding",
+        type=float,
+        default=0.25,
+        help="Quiet zone around each located code, as a fraction of its size (default: 0.25)",
+    )
+    process_group.add_argument(
+        "--locate-fallback",
+        action="store_true",
+        help="Decode the whole image when no located candidate decodes "
+        "(with --tile, such images are always decoded in tiles)",
+    )
+
+    # Cache options
+    cache_group = parser.add_argument_group("Cache Options")
+    cache_group.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse results of unchanged files from the on-disk decode cache",
+    )
+    cache_group.add_argument(
+        "--cache-file", help="Decode cache location (default: ~/.cache/qrtoolkit)"
+    )
+    cache_group.add_argument(
+        "--cache-size",
+        type=int,
+        default=100_000,
+        help="Maximum cached files before least recently used are evicted",
+    )
+    cache_group.add_argument(
+        "--clear-cache", action="store_true", help="Invalidate the decode cache"
+    )
+
+    # Profiling options
+    profile_group = parser.add_argument_group("Profiling Options")
+    profile_group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time spent per stage (read, decode, postprocess, classify, output)",
+    )
+    profile_group.add_argument(
+        "--profile-export",
+        metavar="FILE",
+        help="Write stage histograms as JSON (*.json) or Prometheus text (other names)",
+    )
+
+    # Watch options
+    watch_group = parser.add_argument_group("Watch Options")
+    watch_group.add_argument(
+        "--settle",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="Quiet time after a file is written before it is decoded (default: 0.1)",
+    )
+    watch_group.add_argument(
+        "--poll",
+        nargs="?",
+        type=float,
+        const=1.0,
+        metavar="SECONDS",
+        help="Poll for changes instead of using inotify (default interval: 1.0)",
+    )
+    watch_group.add_argument(
+        "--existing",
+        action="store_true",
+        help="Also decode images already in the directory when watching starts",
+    )
+
+    args = parser.parse_args(argv)
+
+    args.backend = tuple(name.strip() for name in args.backend.split(",") if name)
+    unknown = [name for name in args.backend if name not in BACKENDS]
+    if unknown or not args.backend:
+        parser.error(
+            f"Unknown decoder backend(s): {', '.join(unknown)} "
+            f"(available: {', '.join(BACKENDS)})"
+        )
+
+    if args.tile is not None and args.tile_overlap >= args.tile:
+        parser.error("--tile-overlap must be smaller than the tile size")
+    if args.locate is not None and args.locate < 64:
+        parser.error("--locate size must be at least 64 pixels")
 
-    args = parser.parse_args()
+    if args.pyramid:
+        from .core.decoder import QRDecoder
+
+        try:
+            args.pyramid = QRDecoder.pyramid_levels(args.pyramid.split(","))
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.watch is True:
+        # Bare --watch, or `qrtool watch` with options ahead of the directory
+        if args.directory:
+            args.watch = args.directory
+        elif len(args.inputs) == 1 and os.path.isdir(args.inputs[0]):
+            args.watch = args.inputs.pop()
+        else:
+            parser.error("--watch needs a directory")
+    if args.watch:
+        if not os.path.isdir(args.watch):
+            parser.error(f"Directory not found: {args.watch}")
+        args.directory = None
 
     # Validate input
     input_files = []
+    args.stdin = "-" in args.inputs
     if args.inputs:
-        input_files = args.inputs
+        input_files = [path for path in args.inputs if path != "-"]
     elif args.directory:
-        if not os.path.exists(args.directory):
+        if not os.path.isdir(args.directory):
             parser.error(f"Directory not found: {args.directory}")
-        input_files = [
-            os.path.join(args.directory, f)
-            for f in os.listdir(args.directory)
-            if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".tiff"))
-        ]
+        # Streamed: files are decoded while the walk is still running
+        input_files = DirectoryScanner(
+            args.directory,
+            recursive=args.recursive,
+            include=args.include,
+            exclude=args.exclude,
+            sniff=args.sniff,
+        ).scan()
+
+    if args.clear_cache:
+        from .core.cache import DecodeCache
+
+        cache = DecodeCache(args.cache_file)
+        cache.clear()
+        cache.close()
+        if not args.quiet:
+            logger.info(f"Decode cache cleared: {fg.BLUE_FG}{cache.path}{RESET}")
+        if not any(
+            [
+                input_files,
+                args.stdin,
+                args.camera,
+                args.screenshot,
+                args.video,
+                args.watch,
+            ]
+        ):
+            return 0
 
-    if not any([input_files, args.camera, args.screenshot]):
+    if not any(
+        [input_files, args.stdin, args.camera, args.screenshot, args.video, args.watch]
+    ):
         parser.error(
-            "Please specify an input source (files, directory, camera, or screenshot)"
+            "Please specify an input source (files, directory, watch, camera, video, or screenshot)"
         )
     ArgsProcessor(args, input_files).process()
 
@@ -98,20 +460,82 @@ class ArgsProcessor:
     """
 
     def __init__(self, args, input_files):
+        from .core.decoder import QRDecoder
+        from .core.result import ResultList
+
         self.args = args
-        self.decoder = QRDecoder()
+        cpu_count = os.cpu_count() or 1
+        self.decoder_options = {
+            "use_cache": args.cache,
+            "cache_path": args.cache_file,
+            "cache_size": args.cache_size,
+            "pyramid": args.pyramid,
+            "backends": args.backend,
+            "adaptive": not args.fixed_order,
+            "dpi": args.dpi,
+            "profile": args.profile or bool(args.profile_export),
+            "tile": (
+                {
+                    "tile_size": args.tile,
+                    "overlap": args.tile_overlap,
+                    # Split the CPUs between worker processes and tile threads
+                    "threads": max(1, cpu_count // (args.workers or cpu_count)),
+                }
+                if args.tile
+                else None
+            ),
+            "locate": (
+                {
+                    "max_side": args.locate,
+                    "padding": args.locate_padding,
+                    "fallback": args.locate_fallback,
+                }
+                if args.locate
+                else None
+            ),
+        }
+        self.decoder = QRDecoder(**self.decoder_options)
         self.processor = DataProcessor()
-        self.all_results = []
-        self.input_files = (
-            tqdm(input_files, desc=f"{fg.DWHITE_FG}Files:{RESET}")
-            if len(input_files) > 1
-            else input_files
-        )
+        # Column-backed, a million results fit in tens of megabytes
+        self.all_results = ResultList()
+        self.input_files = input_files
+        self.stats = Counter()
+        self.found = 0
+
+        self.ndjson = None
+        if args.ndjson:
+            from .outputs.ndjson_handler import NDJSONWriter
+
+            self.ndjson = NDJSONWriter(args.ndjson)
+        self.store = None
+        if args.store is not None:
+            from .outputs.store import ResultStore
+
+            self.store = ResultStore(args.store or None)
+        # Streaming alone does not need every result kept in memory
+        self.keep_results = any(
+            [args.json, args.text, args.open_url, args.copy]
+        ) or not (self.ndjson or args.watch)
+
+    def _total_(self):
+        # Directory scans are lazy, their length is unknown up front
+        if hasattr(self.input_files, "__len__"):
+            return len(self.input_files)
+        return None
+
+    def _progress_(self, iterable, total):
+        if total is None or total > 1:
+            from tqdm import tqdm
+
+            return tqdm(iterable, total=total, desc=f"{fg.DWHITE_FG}Files:{RESET}")
+        return iterable
 
     def _map_op_(self) -> None:
         _map_ = {
             self.args.camera: self.use_camera,
             self.args.screenshot: self.use_screenshot,
+            bool(self.args.video): self.use_video,
+            bool(self.args.watch): self.use_watch,
         }
 
         operation_method = next((_map_[key] for key in _map_ if key), None)
@@ -142,37 +566,460 @@ class ArgsProcessor:
             logger.info(
                 f"{fg.DWHITE_FG}Scanning from camera{RESET}{fg.BBLUE_FG}...{RESET}"
             )
-            results = self.decoder.decode_from_video(
-                stream=self.args.stream, timeout=self.args.timeout
+        source = self.args.source
+        results = self.decoder.decode_from_video(
+            stream=self.args.stream,
+            timeout=self.args.timeout,
+            source=int(source) if source.isdigit() else source,
+            display=not self.args.no_display,
+            roi=(
+                {
+                    "padding": self.args.roi_padding,
+                    "full_scan_every": self.args.full_scan_every,
+                }
+                if self.args.roi
+                else None
+            ),
+            skip_static=(
+                {
+                    "threshold": self.args.change_threshold,
+                    "max_skip": self.args.max_skip,
+                }
+                if self.args.skip_static
+                else None
+            ),
+            on_result=self._stream_to_("camera") if self.args.stream else None,
+        )
+        if not self.args.stream:
+            self.collect("camera", results)
+
+        if not self.args.quiet:
+            stats = self.decoder.video_stats
+            logger.info(
+                f"Capture: {fg.CYAN_FG}{stats['capture_fps']:.1f} fps{RESET}, "
+                f"decode: {fg.CYAN_FG}{stats['decode_fps']:.1f} fps{RESET}, "
+                f"latency: {fg.CYAN_FG}{stats['latency_ms']:.1f} ms{RESET} "
+                f"(max {stats['latency_max_ms']:.1f} ms), "
+                f"dropped: {stats['frames_dropped']}, "
+                f"skipped: {stats['frames_skipped']}/{stats['frames_captured']}"
+            )
+            logger.info(
+                f"Decode time: {fg.CYAN_FG}{stats['decode_ms']:.1f} ms/frame{RESET} "
+                f"(full: {stats['full_scans']} x {stats['full_scan_ms']:.1f} ms, "
+                f"roi: {stats['roi_scans']} x {stats['roi_scan_ms']:.1f} ms)"
             )
 
-            self.all_results.extend(results)
+    def use_video(self):
+        from .core.video_scan import VideoScanner
+
+        keyframes = self.args.keyframes
+        if keyframes:
+            try:
+                import av  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "PyAV is required for --keyframes, "
+                    f"sampling at {self.args.sample_fps:g} fps instead"
+                )
+                keyframes = False
+
+        scanner = VideoScanner(
+            self.args.video,
+            sample_fps=self.args.sample_fps,
+            keyframes=keyframes,
+            workers=self.args.workers,
+            backends=self.args.backend,
+        )
+        if not self.args.quiet:
+            length = (
+                f"{scanner.duration:.1f}s"
+                if scanner.duration is not None
+                else "unknown length"
+            )
+            logger.info(
+                f"Scanning video: {fg.BLUE_FG}{self.args.video}{RESET} "
+                f"({length} at {scanner.fps:g} fps)"
+            )
+        started = time.perf_counter()
+        results = scanner.scan()
+        elapsed = time.perf_counter() - started
+        self.collect(self.args.video, results, elapsed)
+
+        if not self.args.quiet:
+            for result in results:
+                logger.info(
+                    f"{fg.GREEN_FG}{result['data']}{RESET} seen "
+                    f"{result['first_seen']:.2f}s - {result['last_seen']:.2f}s "
+                    f"({result['sightings']} frames)"
+                )
+            logger.info(
+                f"Decoded {scanner.frames_decoded} frames in "
+                f"{fg.CYAN_FG}{elapsed:.2f}s{RESET} "
+                f"({scanner.frames_decoded / elapsed if elapsed else 0:.1f} fps)"
+            )
+
+    def use_watch(self):
+        import queue
+        import signal
+        import threading
+        from collections import deque
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        from .core import batch
+        from .input.watcher import DirectoryWatcher
+        from .utils.stats import percentile
+
+        watcher = DirectoryWatcher(
+            self.args.watch,
+            recursive=self.args.recursive,
+            include=self.args.include,
+            exclude=self.args.exclude,
+            sniff=self.args.sniff,
+            settle=self.args.settle,
+            poll=self.args.poll,
+            existing=self.args.existing,
+        )
+        mode = watcher.start()
+        if watcher.fallback and not self.args.quiet:
+            logger.warning(f"inotify unavailable ({watcher.fallback}), polling instead")
+        if not self.args.quiet:
+            logger.info(
+                f"Watching {fg.BLUE_FG}{self.args.watch}{RESET} ({mode}), "
+                "press Ctrl-C to stop"
+            )
+
+        # Settled files and finished decodes arrive on one queue, so the
+        # main thread reacts to either without polling
+        events = queue.SimpleQueue()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for path, detected in watcher.watch(stop):
+                    events.put((path, detected))
+            except Exception as e:
+                events.put((e, None))
+
+        workers = self.args.workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=batch._init_quiet_worker,
+            initargs=(self.decoder_options,),
+        )
+
+        def submit(path, detected):
+            future = pool.submit(batch._decode_chunk, [path])
+            future.add_done_callback(lambda done: events.put((done, detected)))
+
+        # Bounded in-flight decodes; a burst of new files waits in the backlog
+        max_pending = workers * 2
+        in_flight = 0
+        backlog = deque()
+        latencies = deque(maxlen=4096)
+        files = 0
+
+        # Start every worker (and its decoder) before the first file arrives,
+        # and before the SIGTERM handler exists so forked workers keep the default
+        for future in [pool.submit(batch._warm_worker) for _ in range(workers)]:
+            future.result()
+
+        # SIGTERM (service managers) stops as cleanly as Ctrl-C
+        previous = signal.signal(signal.SIGTERM, lambda *_: events.put((None, None)))
+        thread = threading.Thread(target=produce, name="qrtool-watch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, detected = events.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if isinstance(item, Future):
+                    in_flight -= 1
+                    chunk, stats = item.result()
+                    self.stats.update(stats)
+                    latency = time.perf_counter() - detected
+                    latencies.append(latency * 1000)
+                    files += 1
+                    self.collect_watched(*chunk[0], latency)
+                    if backlog:
+                        submit(*backlog.popleft())
+                        in_flight += 1
+                elif in_flight < max_pending:
+                    submit(item, detected)
+                    in_flight += 1
+                else:
+                    backlog.append((item, detected))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            thread.join(timeout=1)
+
+        if not self.args.quiet and latencies:
+            ordered = sorted(latencies)
+            logger.info(
+                f"Watched: {files} files, latency "
+                f"p50 {fg.CYAN_FG}{percentile(ordered, 50):.1f} ms{RESET}, "
+                f"p95 {percentile(ordered, 95):.1f} ms, max {ordered[-1]:.1f} ms"
+            )
+
+    def collect_watched(self, file_path, results, error, seconds, latency):
+        """Report one watched file right away, latency counted from its first event"""
+        if error:
+            self.collect_error(file_path, error)
+            if self.ndjson:
+                self.ndjson.flush()
+            return
+        self.collect(file_path, results, seconds)
+        with PROFILER.stage("output"):
+            if self.ndjson:
+                self.ndjson.flush()
+            if self.store:
+                self.store.flush()
+        if self.args.print and not self.args.quiet and not self.ndjson:
+            for result in results:
+                print(
+                    f"{file_path}: {fg.GREEN_FG}{result.text}{RESET} "
+                    f"({latency * 1000:.1f} ms)"
+                )
+
+    def _stream_to_(self, source):
+        """on_result callback that outputs each new camera or screen code at once"""
+        # Console lines would be mixed into NDJSON written to stdout
+        echo = not self.args.quiet and not (
+            self.ndjson and self.ndjson.output_file == "-"
+        )
+
+        def on_result(result):
+            self.collect(source, [result], result.seconds)
+            with PROFILER.stage("output"):
+                if self.ndjson:
+                    self.ndjson.flush()
+                if self.store:
+                    self.store.flush()
+            if echo:
+                self.decoder._print_stream_result_(result)
 
-        return
+        return on_result
 
     def use_screenshot(self):
-        # TODO: Implement screenshot functionality
         if not self.args.quiet:
-            logger.warn("Screenshot functionality not yet implemented")
+            logger.info(
+                f"{fg.DWHITE_FG}Scanning the screen{RESET}{fg.BBLUE_FG}...{RESET}"
+            )
+        from .utils.Execptions import QRToolException
+
+        try:
+            results = self.decoder.decode_from_screen(
+                stream=self.args.stream,
+                timeout=self.args.timeout,
+                rate=self.args.screen_rate,
+                on_result=self._stream_to_("screen") if self.args.stream else None,
+            )
+        except QRToolException as e:
+            logger.error(f"{fg.RED_FG}{e}{RESET}")
+            return
+        if not self.args.stream:
+            self.collect("screen", results)
+
+        if not self.args.quiet:
+            stats = self.decoder.screen_stats
+            logger.info(
+                f"Captures: {stats['captures']} at "
+                f"{fg.CYAN_FG}{stats['capture_fps']:.1f} fps{RESET} "
+                f"({stats['capture_ms']:.1f} ms each), "
+                f"unchanged: {stats['unchanged']}"
+            )
+            logger.info(
+                f"Decodes: {stats['decodes']} ({stats['full_decodes']} full screen), "
+                f"{fg.CYAN_FG}{stats['decode_rate']:.2f}/s{RESET}, "
+                f"{stats['decode_ms']:.1f} ms per changed capture, "
+                f"{stats['decoded_share']:.1%} of captured pixels decoded"
+            )
+
+    def use_stdin(self):
+        # Decode an image piped on stdin in place, no temp file
+        from .input.buffers import read_stdin
+
+        data = read_stdin()
+        started = time.perf_counter()
+        results = self.decoder.decode_from_bytes(data)
+        self.collect("-", results, time.perf_counter() - started)
 
     def process_files(self):
         # Process files
-        for file_path in self.input_files:
+        total = self._total_()
+        if self.args.use_async and self.input_files:
+            return self.process_files_async()
+        if self.args.workers != 1 and (
+            total is None
+            or total > 1
+            or any(DocumentReader.is_multipage(path) for path in self.input_files)
+        ):
+            return self.process_files_parallel()
+
+        for file_path in self._progress_(self.input_files, total):
             if not self.args.quiet:
-                if len(self.input_files) == 1:
+                if total == 1:
                     logger.info(f"Processing: {file_path}")
-            results = self.decoder.decode_from_image(file_path)
+            started = time.perf_counter()
+            try:
+                results = self.decoder.decode_from_image(file_path)
+            except Exception as e:
+                # One unreadable file must not end the run, as with --workers
+                self.collect_error(file_path, str(e))
+                continue
+            self.collect(file_path, results, time.perf_counter() - started)
+        self.stats.update(self.decoder.drain_stats())
+
+    def process_files_parallel(self):
+        # Fan files out to worker processes, results come back in input order
+        from .core.batch import BatchDecoder
+
+        # With --cache documents go to one worker whole, so they are cached
+        batch = BatchDecoder(
+            workers=self.args.workers or None,
+            chunksize=self.args.chunksize,
+            decoder_options=self.decoder_options,
+            split_documents=not self.args.cache,
+        )
+        total = self._total_()
+        if total is not None and batch.split_documents:
+            # Every page of a multi-page document is reported as its own item
+            total += sum(batch.page_count(path) - 1 for path in self.input_files)
+        self.collect_batch(batch.decode(self.input_files, total=total), total)
+        self.stats.update(batch.stats)
+
+    def process_files_async(self):
+        # Same decoders driven from an event loop, results in completion order
+        import asyncio
+
+        from .core.async_decoder import AsyncQRDecoder
+
+        asyncio.run(self._collect_async_(AsyncQRDecoder, self._total_()))
+
+    async def _collect_async_(self, decoder_class, total):
+        from tqdm.asyncio import tqdm
+
+        async with decoder_class(
+            concurrency=self.args.concurrency, decoder_options=self.decoder_options
+        ) as decoder:
+            items = decoder.decode_many(self.input_files)
+            if total is None or total > 1:
+                items = tqdm(items, total=total, desc=f"{fg.DWHITE_FG}Files:{RESET}")
+            async for file_path, results, error, seconds in items:
+                if error:
+                    self.collect_error(file_path, error)
+                    continue
+                self.collect(file_path, results, seconds)
+        self.stats.update(decoder.stats)
+
+    def collect_batch(self, items, total):
+        """Collect (path, results, error, seconds) items coming back from workers"""
+        for file_path, results, error, seconds in self._progress_(items, total):
+            if error:
+                self.collect_error(file_path, error)
+                continue
+            self.collect(file_path, results, seconds)
+
+    def collect_error(self, source, error):
+        """Report a file that failed to decode and record it in the NDJSON stream"""
+        if not self.args.quiet:
+            logger.error(f"{fg.RED_FG}{source}{RESET}: {error}")
+        if self.ndjson:
+            self.ndjson.write({"source": source, "error": error})
+
+    def collect(self, source, results, seconds=None):
+        """Stream results as they arrive and keep them if an output needs them"""
+        self.found += len(results)
+        with PROFILER.stage("output"):
+            if self.ndjson:
+                elapsed_ms = None if seconds is None else round(seconds * 1000, 3)
+                for result in results:
+                    self.ndjson.write(
+                        {"source": source, **result, "elapsed_ms": elapsed_ms}
+                    )
+            if self.store:
+                self.store.add(source, results)
+        if self.keep_results:
             self.all_results.extend(results)
 
+    def report_stats(self):
+        if self.args.quiet:
+            return
+        if self.decoder.cache is not None:
+            logger.info(
+                f"Cache: {fg.GREEN_FG}{self.stats['cache_hits']} hits{RESET}, "
+                f"{fg.YELLOW_FG}{self.stats['cache_misses']} misses{RESET}"
+            )
+        if self.decoder.pyramid:
+            levels = ", ".join(
+                f"1/{level}: {self.stats[f'pyramid_1/{level}']}"
+                for level in self.decoder.pyramid
+            )
+            logger.info(
+                f"Pyramid: {levels}, {fg.YELLOW_FG}miss: {self.stats['pyramid_miss']}{RESET}"
+            )
+        if self.decoder.tiler is not None and self.stats["tiled_images"]:
+            logger.info(
+                f"Tiling: {self.stats['tiled_images']} images in "
+                f"{self.stats['tiles']} tiles, "
+                f"{self.stats['tile_duplicates']} duplicates merged, "
+                f"{self.stats['tile_seconds'] / self.stats['tiled_images'] * 1000:.0f} ms avg"
+            )
+        if self.decoder.locator is not None and self.stats["locate_images"]:
+            images = self.stats["locate_images"]
+            logger.info(
+                f"Locate: {self.stats['locate_candidates']} candidates in {images} images, "
+                f"locate {self.stats['locate_seconds'] / images * 1000:.0f} ms avg, "
+                f"decode {self.stats['locate_decode_seconds'] / images * 1000:.0f} ms avg"
+                + (
+                    f", {fg.YELLOW_FG}{self.stats['locate_fallbacks']} "
+                    f"{'tiled' if self.args.tile else 'full-image'} fallbacks{RESET}"
+                    if self.args.locate_fallback or self.args.tile
+                    else ""
+                )
+            )
+        if len(self.args.backend) > 1:
+            for name in self.args.backend:
+                calls = self.stats[f"backend_{name}_calls"]
+                mean_ms = self.stats[f"backend_{name}_seconds"] / max(calls, 1) * 1000
+                logger.info(
+                    f"Backend {fg.BLUE_FG}{name}{RESET}: "
+                    f"{self.stats[f'backend_{name}_hits']}/{calls} hits, "
+                    f"{mean_ms:.1f} ms avg"
+                )
+
+    def report_profile(self):
+        from .utils.profiler import Profiler
+
+        # Worker processes ship their profiles back inside the decode stats
+        profile = Profiler()
+        profile.merge(self.stats)
+        profile.merge(PROFILER.drain())
+        if self.args.profile:
+            print(profile.report(), file=sys.stderr)
+        if self.args.profile_export:
+            profile.export(self.args.profile_export)
+            if not self.args.quiet:
+                logger.info(
+                    f"Profile written to: {fg.BLUE_FG}{self.args.profile_export}{RESET}"
+                )
+
     def output_json(self):
+        from tqdm import tqdm
+
         # Handle 2FA secrets specifically
         twofa_secrets = []
-        for data in tqdm(self.decoded_data, desc=f"{fg.DWHITE_FG}Data:{RESET}"):
-            if self.processor.is_2fa_secret(data):
-                twofa_secrets.append(data)
+        for result in tqdm(self.all_results, desc=f"{fg.DWHITE_FG}Data:{RESET}"):
+            if self.processor.result_kind(result) == "otpauth":
+                twofa_secrets.append(result.text)
             else:
                 # Check if data contains 2FA secrets
-                secrets = self.processor.extract_2fa_secrets(data)
+                secrets = self.processor.extract_2fa_secrets(result.text)
                 twofa_secrets.extend(secrets)
 
         if twofa_secrets:
@@ -202,11 +1049,13 @@ class ArgsProcessor:
             logger.info(f"Data saved to text file: {fg.CYAN_FG}{output}{RESET}")
 
     def open_url(self):
-        for data in self.decoded_data:
-            if self.processor.is_url(data):
-                URLHandler.open_url(data)
+        from .outputs.url_handler import URLHandler
+
+        for result in self.all_results:
+            if self.processor.result_kind(result) == "url":
+                URLHandler.open_url(result.text)
                 if not self.args.quiet:
-                    print(f"Opened URL: {fg.BLUE_FG}{data}{RESET}")
+                    print(f"Opened URL: {fg.BLUE_FG}{result.text}{RESET}")
 
     def copy(self):
         try:
@@ -227,27 +1076,45 @@ class ArgsProcessor:
     def process(self):
         try:
             # Handle base processing operation calls
+            if self.args.stdin:
+                self.use_stdin()
             self.process_files()  # For file from input/directory passed
             self._map_op_()  # Camera and screenshot functionality
+            self.report_stats()
 
-            if not self.all_results:
+            if not self.found:
                 if not self.args.quiet:
                     print("No QR codes found", file=sys.stderr)
                 return 1
 
+            if not self.keep_results:
+                # Everything was already streamed as NDJSON or while watching
+                return 0
+
             # Process results
-            self.decoded_data = [result["data"] for result in self.all_results]
+            self.decoded_data = list(self.all_results.texts())
+
+            # Classify once up front, outputs read the kind cached on each result
+            if self.args.json or self.args.open_url:
+                with PROFILER.stage("classify"):
+                    self.all_results.classify(self.processor.classify)
 
-            # Handle output based on flags
-            self._map_ouputs_()
+            with PROFILER.stage("output"):
+                # Handle output based on flags
+                self._map_ouputs_()
 
-            # Handle (URL opening, Copy to clipboard (only first result))
-            self._map_flags_()
+                # Handle (URL opening, Copy to clipboard (only first result))
+                self._map_flags_()
 
-            # Print to console (default behavior)
-            if self.args.print and not self.args.quiet:
-                for i, data in enumerate(self.decoded_data):
-                    print(f"QR Code {i + 1}: {fg.GREEN_FG}{data}{RESET}")
+                # Print to console (default behavior)
+                if (
+                    self.args.print
+                    and not self.args.quiet
+                    and not self.ndjson
+                    and not self.args.watch
+                ):
+                    for i, data in enumerate(self.decoded_data):
+                        print(f"QR Code {i + 1}: {fg.GREEN_FG}{data}{RESET}")
 
             return 0
 
@@ -256,6 +1123,14 @@ class ArgsProcessor:
             print(f"Error: {str(e)}", file=sys.stderr)
             return 1
 
+        finally:
+            if self.ndjson:
+                self.ndjson.close()
+            if self.store:
+                self.store.close()
+            if PROFILER.enabled:
+                self.report_profile()
+
 
 if __name__ == "__main__":
     sys.exit(main())
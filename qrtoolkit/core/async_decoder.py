@@ -0,0 +1,148 @@
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from . import batch
+from .decoder import QRDecoder
+
+
+class AsyncQRDecoder:
+    """
+    asyncio front end to QRDecoder for embedding in async services.
+    File reads and decodes run in an executor, at most `concurrency` at a
+    time, and results are yielded as each input completes. Threads are used
+    by default since zbar and OpenCV release the GIL; processes=True moves
+    decoding to a process pool instead.
+    """
+
+    def __init__(self, concurrency=None, processes=False, decoder_options=None):
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.processes = processes
+        self.decoder_options = decoder_options or {}
+        self.executor = None
+        self.local = threading.local()
+        self.stats = Counter()
+
+    def _executor_(self):
+        if self.executor is None:
+            if self.processes:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.concurrency,
+                    initializer=batch._init_worker,
+                    initargs=(self.decoder_options,),
+                )
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        return self.executor
+
+    def _decode_(self, item):
+        """Blocking decode of one path or buffer on an executor thread"""
+        # Decoders hold backend and sqlite handles, so one per thread
+        decoder = getattr(self.local, "decoder", None)
+        if decoder is None:
+            decoder = self.local.decoder = QRDecoder(**self.decoder_options)
+        try:
+            if isinstance(item, (str, os.PathLike)):
+                results = decoder.decode_from_image(os.fspath(item))
+            else:
+                results = decoder.decode_from_bytes(item)
+            error = None
+        except Exception as e:
+            results, error = [], str(e)
+        return results, error, decoder.drain_stats()
+
+    async def _run_(self, source, item):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        if not self.processes:
+            results, error, stats = await loop.run_in_executor(
+                self._executor_(), self._decode_, item
+            )
+        elif isinstance(item, (str, os.PathLike)):
+            chunk, stats = await loop.run_in_executor(
+                self._executor_(), batch._decode_chunk, [os.fspath(item)]
+            )
+            _, results, error, _ = chunk[0]
+        else:
+            results, error = await loop.run_in_executor(
+                self._executor_(), batch._decode_buffer, item
+            )
+            stats = None
+        if stats:
+            self.stats.update(stats)
+        return source, results, error, time.perf_counter() - started
+
+    @staticmethod
+    async def _items_(items):
+        """Accept sync or async iterables, numbering in-memory buffers"""
+        if hasattr(items, "__aiter__"):
+            index = 0
+            async for item in items:
+                yield index, item
+                index += 1
+        else:
+            for index, item in enumerate(items):
+                yield index, item
+
+    async def decode_many(self, items):
+        """
+        Yield (source, results, error, seconds) in completion order.
+        items holds paths or encoded image buffers, source is the path or,
+        for buffers, the index of the item.
+        """
+        pending = set()
+        try:
+            async for index, item in self._items_(items):
+                if len(pending) >= self.concurrency:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+                source = (
+                    os.fspath(item) if isinstance(item, (str, os.PathLike)) else index
+                )
+                pending.add(asyncio.ensure_future(self._run_(source, item)))
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            # Consumer stopped early. Cancelling the tasks only drops their
+            # results, decodes already on the executor finish in aclose()
+            for task in pending:
+                task.cancel()
+
+    async def decode(self, item):
+        """Decode one path or buffer, raising on failure"""
+        _, results, error, _ = await self._run_(None, item)
+        if error:
+            raise Exception(error)
+        return results
+
+    def close(self):
+        """Blocking shutdown, for use outside an event loop"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def aclose(self):
+        """Drop queued decodes and wait for running ones without blocking the loop"""
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            await asyncio.get_running_loop().run_in_executor(
+                None, partial(executor.shutdown, wait=True, cancel_futures=True)
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,134 @@
+import time
+from collections import Counter, namedtuple
+
+# Mirrors pyzbar's Decoded/Rect/Point so every backend yields the same shape
+Rect = namedtuple("Rect", "left top width height")
+Point = namedtuple("Point", "x y")
+Symbol = namedtuple("Symbol", "data type rect polygon quality orientation")
+
+
+def offset(symbol, dx, dy):
+    """Move a symbol found in a crop back into the coordinates of the full image"""
+    left, top, w, h = symbol.rect
+    rect = type(symbol.rect)(left + dx, top + dy, w, h)
+    polygon = [type(point)(point[0] + dx, point[1] + dy) for point in symbol.polygon]
+    return symbol._replace(rect=rect, polygon=polygon)
+
+
+def overlaps(a, b):
+    """Whether two rects share any area"""
+    return (
+        a.left < b.left + b.width
+        and b.left < a.left + a.width
+        and a.top < b.top + b.height
+        and b.top < a.top + a.height
+    )
+
+
+class DecoderBackend:
+    """Base class for decode engines, decode() returns pyzbar-style symbols"""
+
+    name = None
+
+    def decode(self, image):
+        raise NotImplementedError
+
+
+class PyzbarBackend(DecoderBackend):
+    name = "pyzbar"
+
+    def __init__(self):
+        from pyzbar.pyzbar import decode
+
+        self._decode = decode
+
+    def decode(self, image):
+        return self._decode(image)
+
+
+class OpenCVBackend(DecoderBackend):
+    name = "opencv"
+
+    def __init__(self):
+        import cv2
+
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image):
+        found, texts, points, _ = self.detector.detectAndDecodeMulti(image)
+        if not found:
+            return []
+
+        symbols = []
+        for text, corners in zip(texts, points):
+            if not text:
+                continue
+            xs, ys = corners[:, 0], corners[:, 1]
+            left, top = int(xs.min()), int(ys.min())
+            symbols.append(
+                Symbol(
+                    data=text.encode("utf-8"),
+                    type="QRCODE",
+                    rect=Rect(left, top, int(xs.max()) - left, int(ys.max()) - top),
+                    polygon=[Point(int(x), int(y)) for x, y in corners],
+                    quality=None,
+                    orientation=None,
+                )
+            )
+        return symbols
+
+
+BACKENDS = {
+    PyzbarBackend.name: PyzbarBackend,
+    OpenCVBackend.name: OpenCVBackend,
+}
+
+
+class BackendCascade:
+    """
+    Run backends fastest-first and fall back to the next only on a miss.
+    Each backend is tried first for a few warm-up calls, after which the
+    order follows the measured mean latency.
+    """
+
+    WARMUP = 3
+
+    def __init__(self, names=("pyzbar",), adaptive=True):
+        unknown = [name for name in names if name not in BACKENDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown decoder backend(s): {', '.join(unknown)} "
+                f"(available: {', '.join(BACKENDS)})"
+            )
+        self.backends = [BACKENDS[name]() for name in dict.fromkeys(names)]
+        self.adaptive = adaptive
+        self.stats = Counter()
+        # Lifetime totals used for ordering, never drained
+        self.calls = Counter()
+        self.seconds = Counter()
+
+    def ordered(self):
+        if not self.adaptive or len(self.backends) == 1:
+            return self.backends
+
+        def mean_latency(backend):
+            if self.calls[backend.name] < self.WARMUP:
+                return 0.0
+            return self.seconds[backend.name] / self.calls[backend.name]
+
+        return sorted(self.backends, key=mean_latency)
+
+    def decode(self, image):
+        for backend in self.ordered():
+            started = time.perf_counter()
+            symbols = backend.decode(image)
+            elapsed = time.perf_counter() - started
+
+            self.calls[backend.name] += 1
+            self.seconds[backend.name] += elapsed
+            self.stats[f"backend_{backend.name}_calls"] += 1
+            self.stats[f"backend_{backend.name}_seconds"] += elapsed
+            if symbols:
+                self.stats[f"backend_{backend.name}_hits"] += 1
+                return symbols
+        return []
@@ -0,0 +1,155 @@
+import os
+import signal
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .decoder import QRDecoder
+from ..input.documents import DocumentReader
+
+# One decoder per worker process, created by the pool initializer
+_worker_decoder = None
+
+
+def _init_worker(decoder_options):
+    """Create the per-process decoder once, when the worker starts"""
+    global _worker_decoder
+    _worker_decoder = QRDecoder(**decoder_options)
+
+
+def _init_quiet_worker(decoder_options):
+    """Initializer for long-running pools: Ctrl-C is left to the parent, which shuts workers down"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(decoder_options)
+
+
+def _decode_chunk(paths):
+    """Decode a chunk of files inside a worker, isolating per-file failures"""
+    chunk = []
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            results, error = _worker_decoder.decode_from_image(path), None
+        except Exception as e:
+            results, error = [], str(e)
+        chunk.append((path, results, error, time.perf_counter() - started))
+    return chunk, _worker_decoder.drain_stats()
+
+
+def _decode_pages(path, pages):
+    """Decode a run of document pages inside a worker, opening the file once"""
+    chunk = []
+    try:
+        for page, results, seconds in _worker_decoder.decode_pages(path, pages):
+            chunk.append((path, results, None, seconds))
+    except Exception as e:
+        chunk.append((path, [], f"Error decoding page {pages[len(chunk)]}: {e}", 0.0))
+    return chunk, _worker_decoder.drain_stats()
+
+
+def _decode_buffer(data):
+    """Decode one in-memory image inside a worker"""
+    try:
+        return _worker_decoder.decode_from_bytes(data), None
+    except Exception as e:
+        return [], str(e)
+
+
+def _warm_worker():
+    """No-op task used to make the pool start its workers ahead of requests"""
+    return os.getpid()
+
+
+class BatchDecoder:
+    """
+    Decode many image files across a pool of worker processes.
+    Files are sent out in chunks and results are yielded in input order.
+    With split_documents, the pages of multi-page documents are spread
+    over the same pool as page-range tasks, in place in the input order.
+    """
+
+    def __init__(
+        self, workers=None, chunksize=None, decoder_options=None, split_documents=True
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.decoder_options = decoder_options or {}
+        self.split_documents = split_documents
+        self.stats = Counter()
+        self.page_counts = {}
+
+    def _chunksize_(self, total):
+        """Pick a chunk size that keeps every worker busy with few round trips"""
+        if self.chunksize:
+            return self.chunksize
+        if not total:
+            return 16
+        return max(1, min(64, total // (self.workers * 4)))
+
+    def page_count(self, path):
+        """Pages a file is split into, 1 for images and single-page documents"""
+        if not self.split_documents or not DocumentReader.is_document(path):
+            return 1
+        count = self.page_counts.get(path)
+        if count is None:
+            try:
+                count = DocumentReader(path).page_count()
+            except Exception:
+                # The worker decoding it as a whole reports the error
+                count = 1
+            self.page_counts[path] = count
+        return count
+
+    def _tasks_(self, paths, chunksize):
+        """Yield (fn, args) tasks: chunks of files, page runs of large documents"""
+        chunk = []
+        for path in paths:
+            pages = self.page_count(path)
+            if pages <= 1:
+                chunk.append(path)
+                if len(chunk) >= chunksize:
+                    yield _decode_chunk, (chunk,)
+                    chunk = []
+                continue
+
+            if chunk:
+                yield _decode_chunk, (chunk,)
+                chunk = []
+            numbers = list(range(1, pages + 1))
+            step = self.chunksize or max(1, min(8, pages // (self.workers * 2)))
+            for i in range(0, pages, step):
+                yield _decode_pages, (path, numbers[i : i + step])
+        if chunk:
+            yield _decode_chunk, (chunk,)
+
+    def _ordered_(self, tasks):
+        """Run (fn, args) tasks in the pool, yielding chunk items in order"""
+        # Bound the number of chunks in flight so lazy inputs stay lazy
+        max_pending = self.workers * 2
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.decoder_options,),
+        ) as pool:
+            tasks = iter(tasks)
+            pending = deque()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    fn, args = task
+                    pending.append(pool.submit(fn, *args))
+
+                if not pending:
+                    break
+                chunk, stats = pending.popleft().result()
+                self.stats.update(stats)
+                yield from chunk
+
+    def decode(self, paths, total=None):
+        """Yield (path, results, error, seconds) per file or document page, in input order"""
+        yield from self._ordered_(self._tasks_(iter(paths), self._chunksize_(total)))
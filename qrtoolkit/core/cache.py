@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+
+from .result import DecodeResult
+
+
+def default_cache_path():
+    """Location of the decode cache, following XDG_CACHE_HOME when set"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "qrtoolkit", "decode-cache.sqlite3")
+
+
+class DecodeCache:
+    """
+    Persistent cache of decode results.
+    A (path, size, mtime) match is checked first; on a miss the file
+    content hash is used, so renamed or touched files still hit. Results
+    are stored per (content hash, options) so decoding the same file with
+    other decoder settings is a miss, not the other settings' results.
+    """
+
+    HASH_BLOCK = 1 << 20
+    EVICT_EVERY = 256
+
+    def __init__(self, path=None, max_entries=100_000, options=""):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        # Fingerprint of the decoder options that change what is found
+        self.options = options
+        self.stats = Counter()
+        self._puts = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            -- Keyed by content alone, entries could come from other options
+            DROP TABLE IF EXISTS results;
+            CREATE TABLE IF NOT EXISTS decoded (
+                digest TEXT NOT NULL,
+                options TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (digest, options)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS decoded_last_used ON decoded (last_used);
+            """
+        )
+
+    @classmethod
+    def file_digest(cls, path):
+        """Hash file content in blocks"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while block := f.read(cls.HASH_BLOCK):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _results_(self, digest):
+        row = self.conn.execute(
+            "SELECT payload FROM decoded WHERE digest = ? AND options = ?",
+            (digest, self.options),
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE decoded SET last_used = ? WHERE digest = ? AND options = ?",
+            (time.time(), digest, self.options),
+        )
+        return [DecodeResult.from_dict(record) for record in json.loads(row[0])]
+
+    def get(self, path):
+        """
+        Look up cached results for a file.
+        Returns (key, results) where results is None on a miss; pass the key
+        back to put() so the file is not hashed twice.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (path,)
+        ).fetchone()
+
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            key = (path, st.st_size, st.st_mtime_ns, row[2])
+            results = self._results_(row[2])
+            if results is not None:
+                self.stats["cache_hits"] += 1
+                return key, results
+
+        digest = self.file_digest(path)
+        key = (path, st.st_size, st.st_mtime_ns, digest)
+        results = self._results_(digest)
+        if results is not None:
+            self._remember_file_(key)
+            self.stats["cache_hits"] += 1
+            return key, results
+
+        self.stats["cache_misses"] += 1
+        return key, None
+
+    def _remember_file_(self, key):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            key,
+        )
+
+    def put(self, key, results):
+        """Store the results of a freshly decoded file"""
+        self.conn.execute("BEGIN")
+        try:
+            self._remember_file_(key)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO decoded (digest, options, payload, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    key[3],
+                    self.options,
+                    json.dumps([dict(result) for result in results]),
+                    time.time(),
+                ),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self._puts += 1
+        if self._puts % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used results beyond max_entries"""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM decoded").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+
+        self.conn.execute("BEGIN")
+        self.conn.execute(
+            "DELETE FROM decoded WHERE (digest, options) IN "
+            "(SELECT digest, options FROM decoded ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self.conn.execute(
+            "DELETE FROM files WHERE digest NOT IN (SELECT digest FROM decoded)"
+        )
+        self.conn.execute("COMMIT")
+        self.stats["cache_evictions"] += excess
+        return excess
+
+    def clear(self):
+        """Invalidate every cached entry"""
+        self.conn.execute("BEGIN")
+        self.conn.execute("DELETE FROM files")
+        self.conn.execute("DELETE FROM decoded")
+        self.conn.execute("COMMIT")
+        self.conn.execute("VACUUM")
+
+    def close(self):
+        self.evict()
+        self.conn.close()
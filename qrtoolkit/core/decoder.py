@@ -1,9 +1,15 @@
 import cv2
-from pyzbar.pyzbar import decode
 import os
-import matplotlib.pyplot as plt
 import sys
+import time
+from collections import Counter
+from .backends import BackendCascade
+from .result import DecodeResult
+from ..input.documents import DocumentReader
+from .video import ChangeDetector, RegionTracker, VideoPipeline
 from ..utils.colors import foreground
+from ..utils.profiler import PROFILER
+
 # from ..utils.loger import get_logger
 
 # logger = get_logger()
@@ -11,122 +17,332 @@ from ..utils.colors import foreground
 fg = foreground()
 RESET = fg.RESET
 
+# Pyramid level -> imread flag; libjpeg scales these down while decoding
+PYRAMID_FLAGS = {
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    1: cv2.IMREAD_GRAYSCALE,
+}
+
 
 class QRDecoder:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        use_cache=False,
+        cache_path=None,
+        cache_size=100_000,
+        pyramid=None,
+        backends=("pyzbar",),
+        adaptive=True,
+        dpi=150,
+        tile=None,
+        locate=None,
+        profile=False,
+    ):
+        if profile:
+            PROFILER.enable()
+        self.cascade = BackendCascade(backends, adaptive=adaptive)
+        self.tiler = None
+        if tile is not None:
+            from .tiling import TiledDecoder
+
+            self.tiler = TiledDecoder(backends, adaptive=adaptive, **tile)
+        self.locator = None
+        if locate is not None:
+            from .locator import LocatingDecoder
+
+            locate_options = dict(locate)
+            if self.tiler is not None:
+                # The tiler is the fallback, not one pass over every pixel
+                locate_options["fallback"] = False
+            self.locator = LocatingDecoder(
+                backends, adaptive=adaptive, **locate_options
+            )
+        self.pyramid = self.pyramid_levels(pyramid) if pyramid else None
+        self.dpi = dpi
+        self.cache = None
+        if use_cache:
+            from .cache import DecodeCache
+
+            self.cache = DecodeCache(
+                cache_path,
+                max_entries=cache_size,
+                options=self.cache_options(
+                    pyramid=self.pyramid,
+                    backends=list(backends),
+                    adaptive=adaptive,
+                    dpi=dpi,
+                    # Thread counts change speed, never results
+                    tile=(
+                        {k: v for k, v in tile.items() if k != "threads"}
+                        if tile is not None
+                        else None
+                    ),
+                    locate=locate,
+                ),
+            )
+        self.stats = Counter()
+        self.video_stats = {}
+        self.screen_stats = {}
+
+    @staticmethod
+    def cache_options(**options):
+        """Stable fingerprint of the options that change what a decode finds"""
+        import hashlib
+        import json
+
+        encoded = json.dumps(options, sort_keys=True, default=list)
+        return hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+
+    @staticmethod
+    def pyramid_levels(levels):
+        """Order reduction factors coarsest first, always ending at full size"""
+        levels = {int(level) for level in levels} | {1}
+        unknown = levels - PYRAMID_FLAGS.keys()
+        if unknown:
+            raise ValueError(
+                f"Unsupported pyramid level(s): {sorted(unknown)}, use 2, 4 or 8"
+            )
+        return tuple(sorted(levels, reverse=True))
+
+    def _decode_(self, image):
+        """
+        Decode one image array, through the locator or tiles when enabled.
+        With both, images where nothing located decodes are decoded in tiles.
+        """
+        with PROFILER.stage("decode"):
+            if self.locator is not None:
+                symbols = self.locator.decode(image)
+                if symbols or self.tiler is None:
+                    return symbols
+                self.stats["locate_fallbacks"] += 1
+                return self.tiler.decode(image)
+            if self.tiler is not None:
+                return self.tiler.decode(image)
+            return self.cascade.decode(image)
+
+    def _decode_pyramid_(self, image_path):
+        """Decode grayscale at reduced scale, going up a level only on a miss"""
+        for level in self.pyramid:
+            with PROFILER.stage("read"):
+                image = cv2.imread(image_path, PYRAMID_FLAGS[level])
+            if image is None:
+                return None
+            decoded_objects = self._decode_(image)
+            if decoded_objects:
+                self.stats[f"pyramid_1/{level}"] += 1
+                return decoded_objects, level
+        self.stats["pyramid_miss"] += 1
+        return [], 1
+
+    def _decode_file_(self, image_path):
+        """(decoded_objects, level) for a single-image file, None if it cannot be read"""
+        if self.pyramid:
+            return self._decode_pyramid_(image_path)
+        with PROFILER.stage("read"):
+            image = cv2.imread(image_path, self._read_flag_())
+        if image is None:
+            return None
+        return self._decode_(image), 1
+
+    def drain_stats(self):
+        """Return counters gathered since the last call and reset them"""
+        stats = Counter(self.stats)
+        self.stats.clear()
+        stats.update(self.cascade.stats)
+        self.cascade.stats.clear()
+        if self.tiler is not None:
+            stats.update(self.tiler.drain_stats())
+        if self.locator is not None:
+            stats.update(self.locator.drain_stats())
+        if self.cache is not None:
+            stats.update(self.cache.stats)
+            self.cache.stats.clear()
+        if PROFILER.enabled:
+            stats.update(PROFILER.drain())
+        return stats
+
+    @staticmethod
+    def _results_(decoded_objects, level=1):
+        with PROFILER.stage("postprocess"):
+            results = [DecodeResult.from_symbol(obj, level) for obj in decoded_objects]
+        PROFILER.count("codes", len(results))
+        return results
+
+    @staticmethod
+    def _stamp_(results, source, started):
+        """Record where results came from and how long they took"""
+        seconds = time.perf_counter() - started
+        for result in results:
+            result.source = source
+            result.seconds = seconds
+        return results
+
+    def _read_flag_(self):
+        # Tiling and locating read 8-bit grayscale, a third of the BGR footprint
+        if self.tiler is not None or self.locator is not None:
+            return cv2.IMREAD_GRAYSCALE
+        return cv2.IMREAD_COLOR
+
+    def decode_from_bytes(self, data):
+        """
+        Decode QR code from an encoded image (PNG, JPEG, ...) held in memory.
+        data can be bytes, a memoryview or an mmap, it is decoded in place.
+        """
+        import numpy as np
+
+        try:
+            buffer = np.frombuffer(data, np.uint8)
+            if not buffer.size:
+                raise ValueError("Empty image buffer")
+            with PROFILER.stage("read"):
+                image = cv2.imdecode(buffer, self._read_flag_())
+            if image is None:
+                raise ValueError("Unable to read image from buffer")
+            return self._results_(self._decode_(image))
+
+        except Exception as e:
+            raise Exception(f"Error decoding QR code: {str(e)}")
+
+    def decode_from_array(self, image):
+        """Decode QR code from a uint8 grayscale (H, W) or BGR (H, W, 3) array"""
+        try:
+            if image.dtype != "uint8" or image.ndim not in (2, 3):
+                raise ValueError(
+                    f"Expected a uint8 image array, got {image.dtype} "
+                    f"with shape {image.shape}"
+                )
+            return self._results_(self._decode_(image))
+
+        except Exception as e:
+            raise Exception(f"Error decoding QR code: {str(e)}")
 
     def decode_from_image(self, image_path):
         """Decode QR code from image file"""
+        PROFILER.count("files")
+        started = time.perf_counter()
         try:
             if not os.path.exists(image_path):
                 raise FileNotFoundError(f"Image file not found: {image_path}")
 
-            image = cv2.imread(image_path)
-            decoded_objects = decode(image)
-
-            results = []
-            for obj in decoded_objects:
-                results.append(
-                    {
-                        "data": obj.data.decode("utf-8"),
-                        "type": obj.type,
-                        "quality": getattr(obj, "quality", None),
-                    }
-                )
+            if self.cache is not None:
+                with PROFILER.stage("cache"):
+                    cache_key, cached = self.cache.get(image_path)
+                if cached is not None:
+                    return self._stamp_(cached, image_path, started)
+
+            decoded = None
+            if not DocumentReader.is_multipage(image_path):
+                decoded = self._decode_file_(image_path)
+                if decoded is None and not DocumentReader.is_document(image_path):
+                    raise ValueError(f"Unable to read image: {image_path}")
+
+            if decoded is None:
+                # PDFs and multi-frame TIFF/GIF, or a single frame OpenCV cannot
+                # read; every page carries its number and timing
+                results = self.decode_from_document(image_path)
+            else:
+                results = self._stamp_(self._results_(*decoded), image_path, started)
+
+            if self.cache is not None:
+                with PROFILER.stage("cache"):
+                    self.cache.put(cache_key, results)
 
             return results
 
         except Exception as e:
+            PROFILER.count("errors")
             raise Exception(f"Error decoding QR code: {str(e)}")
 
-    def decode_from_video(self, stream=False, timeout=30):
-        """Decode QR code from video feed with timeout"""
-        cap = cv2.VideoCapture(0)
-        start_time = cv2.getTickCount()
+    def decode_pages(self, path, pages=None):
+        """Yield (page, results, seconds) for each page of a PDF, TIFF or GIF"""
+        reader = DocumentReader(path, dpi=self.dpi)
+        started = time.perf_counter()
+        for page, image in reader.pages(pages):
+            if PROFILER.enabled:
+                # Rasterizing or seeking to the page is this format's read
+                PROFILER.record("read", time.perf_counter() - started)
+            results = self._results_(self._decode_(image))
+            seconds = time.perf_counter() - started
+            for result in results:
+                result.page = page
+                result.source = path
+                result.seconds = seconds
+            self.stats["document_pages"] += 1
+            yield page, results, seconds
+            started = time.perf_counter()
 
-        plt.ion()  # interactive mode on
+    def decode_from_document(self, path, pages=None):
+        """Decode QR codes from every page of a multi-page document"""
+        return [
+            result
+            for _, results, _ in self.decode_pages(path, pages)
+            for result in results
+        ]
 
-        result = []
-        try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                decoded_objects = decode(frame)
-                current_time = (
-                    cv2.getTickCount() - start_time
-                ) / cv2.getTickFrequency()
-
-                if decoded_objects:
-                    for i, _object in enumerate(decoded_objects):
-                        left, top, w, h = _object.rect
-
-                        cv2.rectangle(
-                            frame, (left, top), (left + w, top + h), (0, 255, 0), 2
-                        )
-                        cv2.putText(
-                            frame,
-                            f"QR-{i}",
-                            (left, top - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.9,
-                            (0, 255, 0),
-                            2,
-                        )
-                        if stream:
-                            data = {
-                                "data": _object.data.decode("utf-8"),
-                                "type": _object.type,
-                            }
-                            if data not in result:
-                                result.append(data)
-                                print(
-                                    f"{fg.DWHITE_FG}Data: {fg.BBLUE_FG}{_object.data.decode("utf-8")}{RESET}",
-                                    end="\r",
-                                )
-                    if not stream:
-                        cap.release()
-                        plt.ioff()
-                        plt.close()
-
-                if current_time > timeout and not stream:
-                    break
-
-                # --- Show frame with matplotlib ---
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                plt.imshow(frame_rgb)
-                plt.title("QR Scanner")
-                plt.axis("off")
-                plt.pause(0.001)  # allow UI to update
-                plt.clf()  # clear for next frame
-
-            cap.release()
-            plt.ioff()
-            plt.close()
-            return (
-                result
-                if stream
-                else [
-                    {"data": obj.data.decode("utf-8"), "type": obj.type}
-                    for obj in decoded_objects
-                ]
-            )
+    def decode_from_video(
+        self,
+        stream=False,
+        timeout=30,
+        source=0,
+        display=True,
+        roi=None,
+        skip_static=None,
+        on_result=None,
+    ):
+        """
+        Decode QR code from video feed with timeout.
+        roi: optional RegionTracker options to decode around the last detection
+        skip_static: optional ChangeDetector options to skip unchanged frames
+        on_result: called with each new code as it is decoded; streaming
+        prints them to the console when not given
+        """
+        if stream and on_result is None:
+            on_result = self._print_stream_result_
+        pipeline = VideoPipeline(
+            self.cascade.decode,
+            source=source,
+            stream=stream,
+            timeout=timeout,
+            display=display,
+            on_result=on_result,
+            tracker=RegionTracker(**roi) if roi is not None else None,
+            detector=(
+                ChangeDetector(**skip_static) if skip_static is not None else None
+            ),
+        )
+        results = pipeline.run()
+        self.video_stats = pipeline.stats()
+        return results
 
-        except KeyboardInterrupt:
-            cap.release()
-            plt.ioff()
-            plt.close()
-            return (
-                result
-                if stream
-                else [
-                    {"data": obj.data.decode("utf-8"), "type": obj.type}
-                    for obj in decoded_objects
-                ]
-            )
-            # sys.exit("\nToolKit Exit!")
+    def decode_from_screen(
+        self, stream=False, timeout=30, rate=2.0, grabber=None, on_result=None
+    ):
+        """
+        Decode QR codes shown on screen, capturing rate times per second.
+        Only the regions that changed since the previous capture are decoded.
+        on_result is called with each new code, as in decode_from_video.
+        """
+        from .screen import ScreenScanner
+
+        if stream and on_result is None:
+            on_result = self._print_stream_result_
+        scanner = ScreenScanner(
+            self._decode_,
+            grabber=grabber,
+            rate=rate,
+            stream=stream,
+            timeout=timeout,
+            on_result=on_result,
+        )
+        results = scanner.run()
+        self.screen_stats = scanner.stats()
+        return results
+
+    @staticmethod
+    def _print_stream_result_(result):
+        print(f"{fg.DWHITE_FG}Data: {fg.BBLUE_FG}{result.text}{RESET}", end="\r")
 
 
 if __name__ == "__main__":
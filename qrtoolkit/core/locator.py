@@ -0,0 +1,154 @@
+import math
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+from .backends import BackendCascade, offset, overlaps
+
+
+class LocatingDecoder:
+    """
+    Detect-then-decode for large, mostly empty images such as document scans.
+    Finder patterns are located on a copy downscaled to max_side pixels, then
+    only a padded, perspective-rectified crop around each candidate is decoded
+    at full resolution. Symbols are mapped back to full image coordinates.
+    """
+
+    def __init__(
+        self,
+        backends=("pyzbar",),
+        adaptive=True,
+        max_side=1600,
+        padding=0.25,
+        fallback=False,
+    ):
+        self.cascade = BackendCascade(backends, adaptive)
+        # The ArUco-based detector finds smaller and skewed finder patterns
+        if hasattr(cv2, "QRCodeDetectorAruco"):
+            self.detector = cv2.QRCodeDetectorAruco()
+        else:
+            self.detector = cv2.QRCodeDetector()
+        self.max_side = max_side
+        # Quiet zone added around each candidate, as a fraction of its size
+        self.padding = padding
+        # Decode the whole image when no candidate decodes
+        self.fallback = fallback
+        self.stats = Counter()
+
+    def drain_stats(self):
+        stats = Counter(self.stats)
+        self.stats.clear()
+        stats.update(self.cascade.stats)
+        self.cascade.stats.clear()
+        return stats
+
+    def locate(self, gray):
+        """Return candidate corner quads, float32 (4, 2), in full image coordinates"""
+        # An integer reduction takes OpenCV's much faster INTER_AREA path
+        factor = math.ceil(max(gray.shape[:2]) / self.max_side)
+        scale = 1.0 / factor
+        small = gray
+        if factor > 1:
+            small = cv2.resize(
+                gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+        found, points = self.detector.detectMulti(small)
+        if not found or points is None:
+            return []
+        return [quad / scale for quad in points.reshape(-1, 4, 2).astype(np.float32)]
+
+    def _rectify_(self, gray, quad):
+        """Warp a quad to an upright square with a quiet zone, return crop and inverse"""
+        side = int(max(np.linalg.norm(quad[i] - quad[(i + 1) % 4]) for i in range(4)))
+        pad = int(side * self.padding)
+        target = np.float32(
+            [[pad, pad], [pad + side, pad], [pad + side, pad + side], [pad, pad + side]]
+        )
+        matrix = cv2.getPerspectiveTransform(quad, target)
+        crop = cv2.warpPerspective(
+            gray,
+            matrix,
+            (side + 2 * pad, side + 2 * pad),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=255,
+        )
+        return crop, np.linalg.inv(matrix)
+
+    @staticmethod
+    def _unwarp_(symbol, inverse):
+        """Move a symbol decoded in a rectified crop back to image coordinates"""
+        points = cv2.perspectiveTransform(
+            np.float32([tuple(point) for point in symbol.polygon]).reshape(-1, 1, 2),
+            inverse,
+        ).reshape(-1, 2)
+        point = type(symbol.polygon[0])
+        polygon = [point(int(x), int(y)) for x, y in points]
+        left, top = points.min(axis=0)
+        right, bottom = points.max(axis=0)
+        rect = type(symbol.rect)(
+            int(left), int(top), int(right - left), int(bottom - top)
+        )
+        return symbol._replace(rect=rect, polygon=polygon)
+
+    def _bounding_crop_(self, gray, quad):
+        """Axis-aligned padded box around a quad, as (left, top, right, bottom)"""
+        height, width = gray.shape[:2]
+        left, top = quad.min(axis=0)
+        right, bottom = quad.max(axis=0)
+        pad = max(right - left, bottom - top) * self.padding
+        return (
+            max(0, int(left - pad)),
+            max(0, int(top - pad)),
+            min(width, int(right + pad) + 1),
+            min(height, int(bottom + pad) + 1),
+        )
+
+    def _decode_candidate_(self, gray, quad):
+        crop, inverse = self._rectify_(gray, quad)
+        symbols = self.cascade.decode(crop)
+        if symbols:
+            return [self._unwarp_(symbol, inverse) for symbol in symbols]
+        # Corner estimates can be off on damaged codes; the plain box keeps them
+        left, top, right, bottom = self._bounding_crop_(gray, quad)
+        symbols = self.cascade.decode(gray[top:bottom, left:right])
+        if symbols:
+            self.stats["locate_box_hits"] += 1
+        return [offset(symbol, left, top) for symbol in symbols]
+
+    @staticmethod
+    def _merge_(symbols):
+        """Drop a payload seen again in an overlapping candidate"""
+        kept = []
+        for symbol in symbols:
+            if not any(
+                symbol.data == k.data
+                and symbol.type == k.type
+                and overlaps(symbol.rect, k.rect)
+                for k in kept
+            ):
+                kept.append(symbol)
+        return kept
+
+    def decode(self, image):
+        """Return pyzbar-style symbols in full image coordinates"""
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        started = time.perf_counter()
+        quads = self.locate(gray)
+        located = time.perf_counter()
+        self.stats["locate_images"] += 1
+        self.stats["locate_candidates"] += len(quads)
+        self.stats["locate_seconds"] += located - started
+
+        symbols = []
+        for quad in quads:
+            symbols.extend(self._decode_candidate_(gray, quad))
+        self.stats["locate_decode_seconds"] += time.perf_counter() - located
+
+        if not symbols and self.fallback:
+            self.stats["locate_fallbacks"] += 1
+            return self.cascade.decode(image)
+        return self._merge_(symbols)
@@ -1,22 +1,95 @@
 import re
 import urllib.parse
 
+from .migration import MIGRATION_PREFIX, iter_migration_url
+
+URL_PATTERN = re.compile(
+    r"^(?:http|ftp)s?://"  # http:// or https://
+    # domain...
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
+    r"localhost|"  # localhost...
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+
+# otpauth:// and otpauth-migration:// URLs embedded in free text
+EMBEDDED_2FA_PATTERN = re.compile(r"otpauth(?:-migration)?://\S+")
+
+
+class PayloadClassifier:
+    """
+    Classify a decoded payload in one pass: the scheme before the first ':'
+    is looked up in a prefix table, and only URLs pay for a regex match.
+    """
+
+    KINDS = (
+        "url",
+        "otpauth",
+        "wifi",
+        "vcard",
+        "mecard",
+        "mailto",
+        "geo",
+        "sms",
+        "text",
+    )
+
+    PREFIXES = {
+        "http": "url",
+        "https": "url",
+        "ftp": "url",
+        "ftps": "url",
+        "otpauth": "otpauth",
+        "otpauth-migration": "otpauth",
+        "wifi": "wifi",
+        "begin": "vcard",
+        "mecard": "mecard",
+        "mailto": "mailto",
+        "geo": "geo",
+        "sms": "sms",
+        "smsto": "sms",
+        "mms": "sms",
+        "mmsto": "sms",
+    }
+
+    # Longest scheme in the table, so only a short head is ever lowercased
+    HEAD = max(map(len, PREFIXES)) + 1
+
+    def classify(self, data):
+        scheme, colon, _ = data[: self.HEAD].partition(":")
+        if not colon:
+            return "text"
+        kind = self.PREFIXES.get(scheme.lower(), "text")
+        if kind == "url" and not URL_PATTERN.match(data):
+            return "text"
+        if kind == "vcard" and data[6:11].upper() != "VCARD":
+            return "text"
+        return kind
+
+
+CLASSIFIER = PayloadClassifier()
+
 
 class DataProcessor:
     @staticmethod
     def is_url(data):
         """Check if data is a URL"""
-        url_pattern = re.compile(
-            r"^(?:http|ftp)s?://"  # http:// or https://
-            # domain...
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
-            r"localhost|"  # localhost...
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
-            r"(?::\d+)?"  # optional port
-            r"(?:/?|[/?]\S+)$",
-            re.IGNORECASE,
-        )
-        return bool(url_pattern.match(data))
+        return bool(URL_PATTERN.match(data))
+
+    @staticmethod
+    def classify(data):
+        """Payload kind: url, otpauth, wifi, vcard, mecard, mailto, geo, sms or text"""
+        return CLASSIFIER.classify(data)
+
+    @staticmethod
+    def result_kind(result):
+        """Classify a decode result once, caching the kind on the result"""
+        kind = result.get("kind")
+        if kind is None:
+            kind = result["kind"] = CLASSIFIER.classify(result["data"])
+        return kind
 
     @staticmethod
     def is_2fa_secret(data):
@@ -30,15 +103,14 @@ class DataProcessor:
             return [data]
 
         # Handle multiple secrets or other formats
-        secrets = []
-        prefix = [
-            _str for _str in ("otpauth-migration://", "otpauth://") if _str in data
-        ][0]
-        if prefix:
-            # Simple extraction - can be enhanced
-            secrets = re.findall(rf"{prefix}[^\s]+", data)
+        return EMBEDDED_2FA_PATTERN.findall(data)
 
-        return secrets
+    @staticmethod
+    def parse_2fa_entries(url):
+        """Parse an otpauth URL, or every account of an otpauth-migration export"""
+        if url.startswith(MIGRATION_PREFIX):
+            return iter_migration_url(url)
+        return [DataProcessor.parse_2fa_url(url)]
 
     @staticmethod
     def parse_2fa_url(url):
@@ -48,9 +120,11 @@ class DataProcessor:
 
         return {
             "type": parsed.path.lstrip("/").split("/")[0],
-            "label": parsed.path.lstrip("/").split("/")[1]
-            if len(parsed.path.split("/")) > 2
-            else "",
+            "label": (
+                parsed.path.lstrip("/").split("/")[1]
+                if len(parsed.path.split("/")) > 2
+                else ""
+            ),
             "secret": query_params.get("secret", [""])[0],
             "issuer": query_params.get("issuer", [""])[0],
             "algorithm": query_params.get("algorithm", ["SHA1"])[0],
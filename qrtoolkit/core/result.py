@@ -0,0 +1,311 @@
+"""
+Decoded symbols as compact objects instead of per-result dicts.
+
+DecodeResult keeps the raw payload bytes and decodes text only when it is
+read: UTF-8 first, then ISO-8859-1 (the QR default charset, which accepts
+any byte), so binary payloads no longer abort the whole image. It is also
+a read-only Mapping with the keys the dict results had ("data", "type",
+"quality", "scale", "page", "kind"), plus "rect" and "polygon", so
+result["data"], dict(result) and {**result} keep working.
+
+ResultList holds the results of a large batch as columns in typed arrays
+and shared byte buffers, rebuilding a DecodeResult only when one is read.
+"""
+
+import json
+import math
+import struct
+from array import array
+from collections.abc import Mapping
+
+from .backends import Point, Rect
+
+FALLBACK_ENCODING = "latin-1"
+
+# array("i") slot for a missing quality
+_NO_QUALITY = -(2**31)
+
+
+def decode_text(raw):
+    """Payload bytes as text, falling back to ISO-8859-1 when not UTF-8"""
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode(FALLBACK_ENCODING)
+
+
+def _pack_(polygon):
+    """Flatten [(x, y), ...] into native int32 bytes, readable as array("i")"""
+    coords = [c for point in polygon for c in point]
+    return struct.pack(f"{len(coords)}i", *coords)
+
+
+class DecodeResult(Mapping):
+    """One decoded symbol: raw bytes, symbology, geometry, source and timing"""
+
+    __slots__ = (
+        "raw",
+        "type",
+        "geometry",
+        "quality",
+        "scale",
+        "page",
+        "kind",
+        "source",
+        "seconds",
+    )
+
+    def __init__(
+        self,
+        raw,
+        _type="QRCODE",
+        polygon=None,
+        quality=None,
+        scale=1,
+        page=None,
+        kind=None,
+        source=None,
+        seconds=None,
+    ):
+        self.raw = raw
+        self.type = _type
+        # Polygon corners as packed int32 x, y pairs; the rect is derived
+        self.geometry = _pack_(polygon) if polygon else None
+        self.quality = quality
+        self.scale = scale
+        self.page = page
+        self.kind = kind
+        self.source = source
+        self.seconds = seconds
+
+    @classmethod
+    def from_symbol(cls, symbol, scale=1):
+        """
+        Build from a pyzbar-style symbol returned by a backend.
+        scale is the pyramid reduction the symbol was decoded at; its
+        polygon is scaled back up so geometry is always in full-size pixels.
+        """
+        polygon = symbol.polygon
+        if scale != 1 and polygon:
+            polygon = [(x * scale, y * scale) for x, y in polygon]
+        return cls(
+            symbol.data,
+            symbol.type,
+            polygon,
+            getattr(symbol, "quality", None),
+            scale,
+        )
+
+    @classmethod
+    def from_dict(cls, record):
+        """Rebuild from a dict result, e.g. a cached or deserialized one"""
+        return cls(
+            record["data"].encode(record.get("encoding", "utf-8")),
+            record.get("type", "QRCODE"),
+            record.get("polygon"),
+            record.get("quality"),
+            record.get("scale", 1),
+            record.get("page"),
+            record.get("kind"),
+        )
+
+    @property
+    def text(self):
+        return decode_text(self.raw)
+
+    @property
+    def encoding(self):
+        """Charset the text is decoded with"""
+        if self.raw.isascii():
+            return "utf-8"
+        try:
+            self.raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return FALLBACK_ENCODING
+        return "utf-8"
+
+    @property
+    def polygon(self):
+        if self.geometry is None:
+            return None
+        coords = array("i", self.geometry)
+        return [Point(coords[i], coords[i + 1]) for i in range(0, len(coords), 2)]
+
+    @property
+    def rect(self):
+        """Bounding box of the polygon, as pyzbar computes it"""
+        if self.geometry is None:
+            return None
+        coords = array("i", self.geometry)
+        xs, ys = coords[0::2], coords[1::2]
+        return Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+    def __getitem__(self, key):
+        if key == "data":
+            return self.text
+        if key in ("type", "quality", "scale"):
+            return getattr(self, key)
+        if key == "encoding":
+            encoding = self.encoding
+            if encoding != "utf-8":
+                return encoding
+        elif key in ("page", "kind", "rect", "polygon"):
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        # Lets DataProcessor.result_kind cache the kind as it does on dicts
+        if key not in ("page", "kind"):
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        yield "data"
+        yield "type"
+        yield "quality"
+        yield "scale"
+        if self.page is not None:
+            yield "page"
+        if self.kind is not None:
+            yield "kind"
+        if not self.raw.isascii() and self.encoding != "utf-8":
+            yield "encoding"
+        if self.geometry is not None:
+            yield "rect"
+            yield "polygon"
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Plain record for JSON, with source and elapsed_ms when known"""
+        record = {"source": self.source} if self.source is not None else {}
+        record.update(self)
+        if self.seconds is not None:
+            record["elapsed_ms"] = round(self.seconds * 1000, 3)
+        return record
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def __getstate__(self):
+        # A bare tuple pickles smaller than the default slot-name dict
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"DecodeResult({self.text!r}, {self.type!r})"
+
+
+class _Table:
+    """Small string table, index 0 standing for None"""
+
+    def __init__(self):
+        self.values = [None]
+        self.index = {None: 0}
+
+    def add(self, value):
+        index = self.index.get(value)
+        if index is None:
+            index = self.index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class ResultList:
+    """
+    Append-only list of DecodeResults stored column by column.
+    Payloads and polygons share two byte buffers, the small fields live in
+    typed arrays and strings repeated across results (symbology, kind,
+    source) are stored once. That is about 70 bytes per code plus its
+    payload, a fraction of an object or dict per result.
+    """
+
+    def __init__(self, results=()):
+        self.payloads = bytearray()
+        self.payload_ends = array("Q")
+        self.geometry = bytearray()
+        self.geometry_ends = array("Q")
+        self.quality = array("i")
+        self.scale = array("H")
+        self.page = array("I")
+        self.seconds = array("d")
+        self.types = _Table()
+        self.type_ids = array("H")
+        self.kinds = _Table()
+        self.kind_ids = array("B")
+        self.sources = _Table()
+        self.source_ids = array("I")
+        self.extend(results)
+
+    def append(self, result):
+        if not isinstance(result, DecodeResult):
+            result = DecodeResult.from_dict(result)
+        self.payloads += result.raw
+        self.payload_ends.append(len(self.payloads))
+        if result.geometry is not None:
+            self.geometry += result.geometry
+        self.geometry_ends.append(len(self.geometry))
+        self.quality.append(_NO_QUALITY if result.quality is None else result.quality)
+        self.scale.append(result.scale)
+        self.page.append(result.page or 0)
+        self.seconds.append(math.nan if result.seconds is None else result.seconds)
+        self.type_ids.append(self.types.add(result.type))
+        self.kind_ids.append(self.kinds.add(result.kind))
+        self.source_ids.append(self.sources.add(result.source))
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def __len__(self):
+        return len(self.payload_ends)
+
+    def _payload_(self, index):
+        start = self.payload_ends[index - 1] if index else 0
+        return bytes(self.payloads[start : self.payload_ends[index]])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        result = DecodeResult(
+            self._payload_(index),
+            self.types.values[self.type_ids[index]],
+            None,
+            None if self.quality[index] == _NO_QUALITY else self.quality[index],
+            self.scale[index],
+            self.page[index] or None,
+            self.kinds.values[self.kind_ids[index]],
+            self.sources.values[self.source_ids[index]],
+            None if math.isnan(self.seconds[index]) else self.seconds[index],
+        )
+        start = self.geometry_ends[index - 1] if index else 0
+        if self.geometry_ends[index] > start:
+            result.geometry = bytes(self.geometry[start : self.geometry_ends[index]])
+        return result
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def texts(self):
+        """Yield every payload as text, without building result objects"""
+        # Slicing one immutable copy is about twice as fast as memoryview slices
+        payloads = bytes(self.payloads)
+        start = 0
+        for end in self.payload_ends:
+            yield decode_text(payloads[start:end])
+            start = end
+
+    def classify(self, classify):
+        """Store classify(text) as the kind of every result that has none yet"""
+        for index, text in enumerate(self.texts()):
+            if not self.kind_ids[index]:
+                self.kind_ids[index] = self.kinds.add(classify(text))
@@ -0,0 +1,227 @@
+"""
+Screen capture and continuous screen scanning.
+
+Captures go through Pillow's ImageGrab: X11 through XCB on Linux (any
+display, including Xvfb), native APIs on Windows and macOS. While scanning,
+each capture is compared with the previous one at a fraction of its
+resolution and only the rectangles that changed are decoded, so an idle
+desktop costs one small diff per tick instead of a full-screen decode.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from .backends import offset
+from .result import DecodeResult
+from ..utils.Execptions import QRToolException
+
+
+class ScreenGrabber:
+    """Grab the screen, or a bbox of it, as an 8-bit grayscale array"""
+
+    def __init__(self, display=None, bbox=None):
+        self.display = display
+        self.bbox = bbox
+
+    def grab(self):
+        from PIL import ImageGrab
+
+        try:
+            if self.display:
+                image = ImageGrab.grab(bbox=self.bbox, xdisplay=self.display)
+            else:
+                image = ImageGrab.grab(bbox=self.bbox)
+        except OSError as e:
+            raise QRToolException(f"Unable to capture the screen: {e}") from None
+        return np.asarray(image.convert("L"))
+
+
+class ChangedRegions:
+    """
+    Find the rectangles where a capture differs from the previous one.
+    Captures are diffed at 1/scale resolution; changed areas are grown by
+    padding so a code's quiet zone is included in the crop, and overlapping
+    rectangles are merged.
+    """
+
+    def __init__(self, scale=8, threshold=8, padding=32, min_size=16, full_ratio=0.5):
+        self.scale = scale
+        self.threshold = threshold
+        self.padding = padding
+        # Changes thinner than this (a blinking cursor) cannot hold a code
+        self.min_size = min_size
+        # Above this share of the screen one full decode is cheaper
+        self.full_ratio = full_ratio
+        self.previous = None
+        self.kernel = np.ones((3, 3), np.uint8)
+
+    @staticmethod
+    def _merge_(rects):
+        """Merge overlapping (x0, y0, x1, y1) rectangles until none overlap"""
+        rects = list(rects)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(rects)):
+                for j in range(i + 1, len(rects)):
+                    a, b = rects[i], rects[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        rects[i] = (
+                            min(a[0], b[0]),
+                            min(a[1], b[1]),
+                            max(a[2], b[2]),
+                            max(a[3], b[3]),
+                        )
+                        del rects[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return rects
+
+    def update(self, frame):
+        """Return the changed rectangles of frame; the whole frame on the first call"""
+        height, width = frame.shape[:2]
+        small = cv2.resize(
+            frame,
+            (max(1, width // self.scale), max(1, height // self.scale)),
+            interpolation=cv2.INTER_AREA,
+        )
+        previous, self.previous = self.previous, small
+        if previous is None or previous.shape != small.shape:
+            return [(0, 0, width, height)]
+
+        mask = (cv2.absdiff(small, previous) > self.threshold).astype(np.uint8)
+        if not mask.any():
+            return []
+        # Join changes a few pixels apart, e.g. the modules of one code
+        mask = cv2.dilate(mask, self.kernel)
+        _, _, components, _ = cv2.connectedComponentsWithStats(mask)
+
+        s, pad = self.scale, self.padding
+        rects = [
+            (
+                max(0, x * s - pad),
+                max(0, y * s - pad),
+                min(width, (x + w) * s + pad),
+                min(height, (y + h) * s + pad),
+            )
+            for x, y, w, h, _ in components[1:].tolist()
+            # Dilation grew every component by a pixel on each side
+            if (min(w, h) - 2) * s >= self.min_size
+        ]
+        rects = self._merge_(rects)
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        if area >= self.full_ratio * width * height:
+            return [(0, 0, width, height)]
+        return rects
+
+
+class ScreenScanner:
+    """
+    Capture the screen at a fixed rate and decode only what changed.
+    Without stream, stops at the first code or when timeout expires.
+    """
+
+    def __init__(
+        self,
+        decode,
+        grabber=None,
+        rate=2.0,
+        stream=False,
+        timeout=30,
+        regions=None,
+        on_result=None,
+    ):
+        self.decode = decode
+        self.grabber = grabber or ScreenGrabber()
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.stream = stream
+        self.timeout = timeout
+        self.regions = regions or ChangedRegions()
+        self.on_result = on_result
+
+        self.results = []
+        self.seen = set()
+        self.started = 0.0
+        self.captures = 0
+        self.unchanged = 0
+        self.decodes = 0
+        self.full_decodes = 0
+        self.capture_time = 0.0
+        self.decode_time = 0.0
+        self.pixels_captured = 0
+        self.pixels_decoded = 0
+
+    def _expired_(self):
+        return not self.stream and time.monotonic() - self.started > self.timeout
+
+    def tick(self):
+        """Capture once and decode the changed regions, return new results"""
+        started = time.perf_counter()
+        frame = self.grabber.grab()
+        captured = time.perf_counter()
+        self.captures += 1
+        self.capture_time += captured - started
+        self.pixels_captured += frame.shape[0] * frame.shape[1]
+
+        rects = self.regions.update(frame)
+        if not rects:
+            self.unchanged += 1
+            return []
+
+        found = []
+        for x0, y0, x1, y1 in rects:
+            if (x1 - x0) * (y1 - y0) == frame.shape[0] * frame.shape[1]:
+                self.full_decodes += 1
+            self.decodes += 1
+            self.pixels_decoded += (x1 - x0) * (y1 - y0)
+            for _object in self.decode(frame[y0:y1, x0:x1]):
+                key = (_object.data, _object.type)
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                result = DecodeResult.from_symbol(offset(_object, x0, y0))
+                result.source = "screen"
+                self.results.append(result)
+                found.append(result)
+                if self.on_result:
+                    self.on_result(result)
+        self.decode_time += time.perf_counter() - captured
+        return found
+
+    def run(self):
+        """Scan until a code is found (or forever with stream), the timeout or Ctrl-C"""
+        self.started = time.monotonic()
+        next_at = self.started
+        try:
+            while not self._expired_():
+                if self.tick() and not self.stream:
+                    break
+                # Keep the capture rate, without bursting to catch up after a slow tick
+                next_at = max(next_at + self.interval, time.monotonic())
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+        return self.results
+
+    def stats(self):
+        """Capture and decode rates, and how much of the screen was decoded"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "captures": self.captures,
+            "unchanged": self.unchanged,
+            "capture_fps": self.captures / elapsed,
+            "capture_ms": self.capture_time / max(self.captures, 1) * 1000,
+            "decodes": self.decodes,
+            "full_decodes": self.full_decodes,
+            "decode_rate": self.decodes / elapsed,
+            "decode_ms": self.decode_time
+            / max(self.captures - self.unchanged, 1)
+            * 1000,
+            "decoded_share": self.pixels_decoded / max(self.pixels_captured, 1),
+        }
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from .backends import BackendCascade, offset, overlaps
+
+
+class TiledDecoder:
+    """
+    Decode very large images as overlapping tiles in a thread pool.
+    Tiles are views into one grayscale image and at most max_pending of them
+    are in flight, so decoder buffers stay bounded. A downscaled overview pass
+    catches codes larger than the overlap, and detections seen in more than
+    one tile are merged by their rects.
+    """
+
+    def __init__(
+        self,
+        backends=("pyzbar",),
+        adaptive=True,
+        tile_size=2048,
+        overlap=256,
+        threads=None,
+    ):
+        if overlap >= tile_size:
+            raise ValueError("Tile overlap must be smaller than the tile size")
+        self.backends = backends
+        self.adaptive = adaptive
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.threads = threads or os.cpu_count() or 1
+        self.max_pending = self.threads * 2
+        self.local = threading.local()
+        self.cascades = []
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    def _cascade_(self):
+        """One cascade per thread, backends are not safe to share"""
+        cascade = getattr(self.local, "cascade", None)
+        if cascade is None:
+            cascade = self.local.cascade = BackendCascade(self.backends, self.adaptive)
+            with self.lock:
+                self.cascades.append(cascade)
+        return cascade
+
+    def drain_stats(self):
+        stats = Counter(self.stats)
+        self.stats.clear()
+        for cascade in self.cascades:
+            stats.update(cascade.stats)
+            cascade.stats.clear()
+        return stats
+
+    def tiles(self, height, width):
+        """Yield (left, top, right, bottom) boxes covering the image with overlap"""
+        step = self.tile_size - self.overlap
+        for top in range(0, max(1, height - self.overlap), step):
+            for left in range(0, max(1, width - self.overlap), step):
+                yield (
+                    left,
+                    top,
+                    min(width, left + self.tile_size),
+                    min(height, top + self.tile_size),
+                )
+
+    def _decode_tile_(self, image, box):
+        left, top, right, bottom = box
+        decoded_objects = self._cascade_().decode(image[top:bottom, left:right])
+        return [offset(o, left, top) for o in decoded_objects]
+
+    def _overview_(self, image):
+        """Decode the whole image shrunk to one tile, for codes spanning tiles"""
+        height, width = image.shape[:2]
+        scale = self.tile_size / max(height, width)
+        small = cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+        )
+        decoded_objects = []
+        for o in self._cascade_().decode(small):
+            rect = type(o.rect)(*(int(value / scale) for value in o.rect))
+            polygon = [
+                type(point)(int(point[0] / scale), int(point[1] / scale))
+                for point in o.polygon
+            ]
+            decoded_objects.append(o._replace(rect=rect, polygon=polygon))
+        return decoded_objects
+
+    def merge(self, decoded_objects):
+        """Drop detections of the same payload whose rects overlap, keeping the largest"""
+        kept = []
+        for o in sorted(
+            decoded_objects, key=lambda o: o.rect.width * o.rect.height, reverse=True
+        ):
+            if any(
+                o.data == k.data and o.type == k.type and overlaps(o.rect, k.rect)
+                for k in kept
+            ):
+                self.stats["tile_duplicates"] += 1
+                continue
+            kept.append(o)
+        return kept
+
+    def decode(self, image):
+        """Return pyzbar-style symbols in full image coordinates"""
+        height, width = image.shape[:2]
+        if max(height, width) <= self.tile_size:
+            return self._cascade_().decode(image)
+
+        started = time.perf_counter()
+        decoded_objects = []
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            pending = deque([pool.submit(self._overview_, image)])
+            for box in self.tiles(height, width):
+                pending.append(pool.submit(self._decode_tile_, image, box))
+                self.stats["tiles"] += 1
+                # Bounded in-flight window keeps decoder buffers capped
+                while len(pending) >= self.max_pending:
+                    decoded_objects.extend(pending.popleft().result())
+            while pending:
+                decoded_objects.extend(pending.popleft().result())
+
+        self.stats["tiled_images"] += 1
+        self.stats["tile_seconds"] += time.perf_counter() - started
+        return self.merge(decoded_objects)
@@ -0,0 +1,358 @@
+import threading
+import time
+
+import cv2
+
+from .backends import offset
+from .result import DecodeResult
+
+
+class FrameGrabber:
+    """Capture thread that only ever holds the most recent frame"""
+
+    def __init__(self, source=0):
+        self.source = source
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Unable to open video source: {source}")
+
+        # Pace video files at their native rate so they can stand in for a camera
+        self.interval = 0.0
+        if isinstance(source, str):
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            self.interval = 1.0 / fps if fps > 0 else 0.0
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_id = 0
+        self.captured_at = 0.0
+        self.running = False
+        self.thread = threading.Thread(
+            target=self._run_, name="qr-capture", daemon=True
+        )
+
+    def start(self):
+        self.running = True
+        self.thread.start()
+        return self
+
+    def _run_(self):
+        next_at = time.monotonic()
+        try:
+            while self.running:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                with self.condition:
+                    self.frame = frame
+                    self.frame_id += 1
+                    self.captured_at = time.monotonic()
+                    self.condition.notify_all()
+
+                if self.interval:
+                    next_at += self.interval
+                    delay = next_at - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            self.cap.release()
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+
+    def latest(self, after_id=0, timeout=0.1):
+        """
+        Wait for a frame newer than after_id.
+        Returns (frame_id, frame, captured_at) or None on timeout/end of source.
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.frame_id > after_id or not self.running, timeout
+            )
+            if self.frame_id > after_id:
+                return self.frame_id, self.frame, self.captured_at
+            return None
+
+    def stop(self):
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+
+class ChangeDetector:
+    """
+    Compare a small grayscale thumbnail against the last decoded frame and
+    report whether the scene changed enough to be worth decoding again.
+    """
+
+    def __init__(self, threshold=2.0, size=(64, 36), max_skip=0):
+        self.threshold = threshold
+        self.size = size
+        self.max_skip = max_skip
+        self.reference = None
+        self.run = 0
+        self.skipped = 0
+        self.passed = 0
+
+    def thumbnail(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def changed(self, frame):
+        small = self.thumbnail(frame)
+        if self.reference is not None:
+            difference = cv2.absdiff(small, self.reference).mean()
+            if difference < self.threshold and (
+                not self.max_skip or self.run < self.max_skip
+            ):
+                self.run += 1
+                self.skipped += 1
+                return False
+
+        self.reference = small
+        self.run = 0
+        self.passed += 1
+        return True
+
+
+class RegionTracker:
+    """
+    Decode only a padded crop around the last detection.
+    A full-frame scan runs every full_scan_every frames or when the crop misses.
+    """
+
+    def __init__(self, padding=0.5, full_scan_every=30):
+        self.padding = padding
+        self.full_scan_every = full_scan_every
+        self.region = None
+        self.since_full_scan = 0
+        self.last_scan = None
+
+    def _track_(self, decoded_objects, width, height):
+        left = min(o.rect[0] for o in decoded_objects)
+        top = min(o.rect[1] for o in decoded_objects)
+        right = max(o.rect[0] + o.rect[2] for o in decoded_objects)
+        bottom = max(o.rect[1] + o.rect[3] for o in decoded_objects)
+        pad = int(max(right - left, bottom - top) * self.padding)
+        self.region = (
+            max(0, left - pad),
+            max(0, top - pad),
+            min(width, right + pad),
+            min(height, bottom + pad),
+        )
+
+    def decode(self, decode, frame):
+        height, width = frame.shape[:2]
+        if self.region is not None and self.since_full_scan < self.full_scan_every:
+            self.since_full_scan += 1
+            self.last_scan = "roi"
+            x0, y0, x1, y1 = self.region
+            decoded_objects = decode(frame[y0:y1, x0:x1])
+            if decoded_objects:
+                decoded_objects = [offset(o, x0, y0) for o in decoded_objects]
+                self._track_(decoded_objects, width, height)
+                return decoded_objects
+
+        # Periodic or fallback full-frame scan
+        self.since_full_scan = 0
+        self.last_scan = "full"
+        decoded_objects = decode(frame)
+        if decoded_objects:
+            self._track_(decoded_objects, width, height)
+        else:
+            self.region = None
+        return decoded_objects
+
+
+class VideoPipeline:
+    """
+    Capture, decode and display on separate stages.
+    The decode worker always takes the newest frame, frames captured while
+    it was busy are dropped instead of queued.
+    """
+
+    def __init__(
+        self,
+        decode,
+        source=0,
+        stream=False,
+        timeout=30,
+        display=True,
+        on_result=None,
+        tracker=None,
+        detector=None,
+    ):
+        self.decode = decode
+        self.tracker = tracker
+        self.detector = detector
+        self.grabber = FrameGrabber(source)
+        self.stream = stream
+        self.timeout = timeout
+        self.display = display
+        self.on_result = on_result
+
+        self.done = threading.Event()
+        self.results = []
+        self.seen = set()
+        self.detections = []
+        self.started = 0.0
+
+        self.decoded = 0
+        self.dropped = 0
+        self.decode_time = 0.0
+        self.last_decode_ms = 0.0
+        # Per scan kind ("full" or "roi"): [frames, seconds]
+        self.scan_times = {"full": [0, 0.0], "roi": [0, 0.0]}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def _expired_(self):
+        return not self.stream and time.monotonic() - self.started > self.timeout
+
+    def _decode_loop_(self):
+        last_id = 0
+        try:
+            while not self.done.is_set():
+                item = self.grabber.latest(last_id)
+                if item is None:
+                    if not self.grabber.running:
+                        break
+                    continue
+
+                frame_id, frame, captured_at = item
+                self.dropped += frame_id - last_id - 1
+                last_id = frame_id
+
+                if self.detector is not None and not self.detector.changed(frame):
+                    continue
+
+                started = time.monotonic()
+                if self.tracker is not None:
+                    decoded_objects = self.tracker.decode(self.decode, frame)
+                    scan = self.tracker.last_scan
+                else:
+                    decoded_objects = self.decode(frame)
+                    scan = "full"
+                finished = time.monotonic()
+
+                self.decoded += 1
+                self.decode_time += finished - started
+                self.last_decode_ms = (finished - started) * 1000
+                self.scan_times[scan][0] += 1
+                self.scan_times[scan][1] += finished - started
+                latency = finished - captured_at
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                self.detections = decoded_objects
+
+                for _object in decoded_objects:
+                    key = (_object.data, _object.type)
+                    if key not in self.seen:
+                        self.seen.add(key)
+                        result = DecodeResult.from_symbol(_object)
+                        result.source = "camera"
+                        self.results.append(result)
+                        if self.on_result:
+                            self.on_result(result)
+
+                if decoded_objects and not self.stream:
+                    break
+        finally:
+            self.done.set()
+
+    def annotate(self, frame):
+        """Draw the latest detections onto a frame"""
+        for i, _object in enumerate(self.detections):
+            left, top, w, h = _object.rect
+            cv2.rectangle(frame, (left, top), (left + w, top + h), (0, 255, 0), 2)
+            cv2.putText(
+                frame,
+                f"QR-{i}",
+                (left, top - 10),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.9,
+                (0, 255, 0),
+                2,
+            )
+        return frame
+
+    def _display_loop_(self):
+        import matplotlib.pyplot as plt
+
+        plt.ion()  # interactive mode on
+        figure, axes = plt.subplots()
+        axes.set_title("QR Scanner")
+        axes.axis("off")
+        image = None
+        shown_id = 0
+        try:
+            while not self.done.is_set() and not self._expired_():
+                item = self.grabber.latest(shown_id)
+                if item is None:
+                    continue
+                shown_id, frame, _ = item
+
+                frame_rgb = cv2.cvtColor(self.annotate(frame.copy()), cv2.COLOR_BGR2RGB)
+                if image is None:
+                    image = axes.imshow(frame_rgb)
+                else:
+                    image.set_data(frame_rgb)
+                plt.pause(0.001)  # allow UI to update
+
+                if not plt.fignum_exists(figure.number):
+                    break
+        finally:
+            plt.ioff()
+            plt.close(figure)
+
+    def _wait_(self):
+        while not self.done.wait(0.1):
+            if self._expired_():
+                break
+
+    def run(self):
+        """Run until a code is found, the timeout expires or the source ends"""
+        self.started = time.monotonic()
+        self.grabber.start()
+        worker = threading.Thread(
+            target=self._decode_loop_, name="qr-decode", daemon=True
+        )
+        worker.start()
+        try:
+            if self.display:
+                self._display_loop_()
+            else:
+                self._wait_()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.done.set()
+            worker.join()
+            self.grabber.stop()
+        return self.results
+
+    @staticmethod
+    def _mean_ms_(frames, seconds):
+        return seconds / frames * 1000 if frames else 0.0
+
+    def stats(self):
+        """Capture/decode throughput and capture-to-result latency"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        decoded = max(self.decoded, 1)
+        return {
+            "frames_captured": self.grabber.frame_id,
+            "frames_decoded": self.decoded,
+            "frames_dropped": self.dropped,
+            "frames_skipped": self.detector.skipped if self.detector else 0,
+            "capture_fps": self.grabber.frame_id / elapsed,
+            "decode_fps": self.decoded / elapsed,
+            "decode_ms": self.decode_time / decoded * 1000,
+            "full_scans": self.scan_times["full"][0],
+            "full_scan_ms": self._mean_ms_(*self.scan_times["full"]),
+            "roi_scans": self.scan_times["roi"][0],
+            "roi_scan_ms": self._mean_ms_(*self.scan_times["roi"]),
+            "latency_ms": self.latency_total / decoded * 1000,
+            "latency_max_ms": self.latency_max * 1000,
+        }
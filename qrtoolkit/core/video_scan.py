@@ -0,0 +1,167 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from .backends import BackendCascade
+from .result import decode_text
+
+
+def _merge_(seen, data, _type, timestamp):
+    key = (data, _type)
+    if key in seen:
+        entry = seen[key]
+        entry["first_seen"] = min(entry["first_seen"], timestamp)
+        entry["last_seen"] = max(entry["last_seen"], timestamp)
+        entry["sightings"] += 1
+    else:
+        seen[key] = {
+            "data": data,
+            "type": _type,
+            "first_seen": timestamp,
+            "last_seen": timestamp,
+            "sightings": 1,
+        }
+
+
+def _record_(seen, decoded_objects, timestamp):
+    for _object in decoded_objects:
+        _merge_(seen, decode_text(_object.data), _object.type, timestamp)
+
+
+def _scan_segment(path, start_frame, end_frame, step, backends):
+    """
+    Decode every step-th frame in [start_frame, end_frame) of a video file.
+    With end_frame None, frames are read until the stream runs out.
+    """
+    cascade = BackendCascade(backends)
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    seen = {}
+    decoded = 0
+    try:
+        indices = (
+            itertools.count(start_frame)
+            if end_frame is None
+            else range(start_frame, end_frame)
+        )
+        for index in indices:
+            # grab() skips the pixel conversion for frames that are not sampled
+            if not cap.grab():
+                break
+            if (index - start_frame) % step:
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            decoded += 1
+            _record_(seen, cascade.decode(frame), round(index / fps, 3))
+    finally:
+        cap.release()
+    return list(seen.values()), decoded
+
+
+def _scan_keyframes(path, backends):
+    """Decode only the key frames, using PyAV to skip non-key frames in the codec"""
+    import av
+
+    cascade = BackendCascade(backends)
+    seen = {}
+    decoded = 0
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = "NONKEY"
+        for frame in container.decode(stream):
+            decoded += 1
+            _record_(seen, cascade.decode(frame.to_ndarray(format="bgr24")), frame.time)
+    return list(seen.values()), decoded
+
+
+class VideoScanner:
+    """
+    Scan a recorded video for QR codes.
+    Frames are sampled at sample_fps (or key frames only), long videos are
+    split into time segments decoded in parallel, and codes seen on many
+    frames are reported once with their first and last timestamps.
+    """
+
+    def __init__(
+        self, path, sample_fps=2.0, keyframes=False, workers=1, backends=("pyzbar",)
+    ):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Video file not found: {path}")
+        self.path = path
+        self.sample_fps = sample_fps
+        self.keyframes = keyframes
+        self.workers = workers or os.cpu_count() or 1
+        self.backends = backends
+        self.frames_decoded = 0
+
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise IOError(f"Unable to open video: {path}")
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+    @property
+    def duration(self):
+        """Length in seconds, None when the container does not report a frame count"""
+        if self.frame_count <= 0:
+            return None
+        return self.frame_count / self.fps
+
+    def segments(self):
+        """Split the video into one frame range per worker, aligned to the sampling step"""
+        step = max(1, round(self.fps / self.sample_fps)) if self.sample_fps else 1
+        if self.frame_count <= 0:
+            # Streams and some containers report no frame count, so the
+            # video cannot be split; read it in one pass to the end
+            return step, [(0, None)]
+        samples = -(-self.frame_count // step)
+        per_worker = -(-samples // self.workers) * step
+        return step, [
+            (start, min(start + per_worker, self.frame_count))
+            for start in range(0, self.frame_count, per_worker)
+        ]
+
+    def scan(self):
+        """Return deduplicated results ordered by first sighting"""
+        if self.keyframes:
+            found, self.frames_decoded = _scan_keyframes(self.path, self.backends)
+            return sorted(found, key=lambda entry: entry["first_seen"])
+
+        step, segments = self.segments()
+        if len(segments) <= 1 or self.workers == 1:
+            parts = [
+                _scan_segment(self.path, start, end, step, self.backends)
+                for start, end in segments
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [
+                    pool.submit(
+                        _scan_segment, self.path, start, end, step, self.backends
+                    )
+                    for start, end in segments
+                ]
+                parts = [future.result() for future in futures]
+
+        seen = {}
+        for found, decoded in parts:
+            self.frames_decoded += decoded
+            for entry in found:
+                key = (entry["data"], entry["type"])
+                if key in seen:
+                    merged = seen[key]
+                    merged["first_seen"] = min(
+                        merged["first_seen"], entry["first_seen"]
+                    )
+                    merged["last_seen"] = max(merged["last_seen"], entry["last_seen"])
+                    merged["sightings"] += entry["sightings"]
+                else:
+                    seen[key] = entry
+        return sorted(seen.values(), key=lambda entry: entry["first_seen"])
@@ -0,0 +1,25 @@
+import mmap
+import os
+import stat
+import sys
+
+
+def map_file(path):
+    """Map a file read-only so it can be decoded without reading it into memory"""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_stdin():
+    """
+    Return stdin as a buffer: mapped when it is redirected from a regular
+    file, read in one call when it is a pipe.
+    """
+    stream = sys.stdin.buffer
+    try:
+        if stat.S_ISREG(os.fstat(stream.fileno()).st_mode):
+            return mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Not a real file descriptor, or an empty file mmap refuses
+        pass
+    return stream.read()
@@ -0,0 +1,110 @@
+import os
+
+from ..utils.Execptions import QRToolException
+
+DOCUMENT_EXTENSIONS = (".pdf", ".tif", ".tiff", ".gif")
+
+
+class DocumentReader:
+    """
+    Iterate the pages of a PDF or the frames of a multi-page TIFF/GIF.
+    Pages are rasterized to grayscale one at a time, so memory stays flat
+    however many pages the document has.
+    """
+
+    def __init__(self, path, dpi=150):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Document not found: {path}")
+        self.path = path
+        self.dpi = dpi
+        self.is_pdf = path.lower().endswith(".pdf")
+
+    @staticmethod
+    def is_document(path):
+        """Whether the extension is one that can hold several pages"""
+        return path.lower().endswith(DOCUMENT_EXTENSIONS)
+
+    @classmethod
+    def is_multipage(cls, path):
+        """PDFs, and TIFF/GIF files with more than one frame"""
+        if path.lower().endswith(".pdf"):
+            return True
+        if not cls.is_document(path):
+            return False
+        try:
+            return cls(path).page_count() > 1
+        except Exception:
+            # Left to the image reader, which reports the error
+            return False
+
+    def _open_pdf_(self):
+        """Prefer pypdfium2 and fall back to PyMuPDF, both are optional"""
+        try:
+            import pypdfium2
+
+            return "pdfium", pypdfium2.PdfDocument(self.path)
+        except ImportError:
+            pass
+        try:
+            import fitz
+
+            return "fitz", fitz.open(self.path)
+        except ImportError:
+            raise QRToolException(
+                "PDF input requires pypdfium2 or PyMuPDF (pip install pypdfium2)"
+            ) from None
+
+    def page_count(self):
+        if self.is_pdf:
+            _, document = self._open_pdf_()
+            try:
+                return len(document)
+            finally:
+                document.close()
+
+        from PIL import Image
+
+        with Image.open(self.path) as image:
+            return getattr(image, "n_frames", 1)
+
+    def pages(self, numbers=None):
+        """Yield (page_number, grayscale array) for the given 1-based pages, or all"""
+        if self.is_pdf:
+            yield from self._pdf_pages_(numbers)
+        else:
+            yield from self._frame_pages_(numbers)
+
+    def _pdf_pages_(self, numbers):
+        import numpy as np
+
+        engine, document = self._open_pdf_()
+        if engine == "fitz":
+            import fitz
+
+        try:
+            numbers = numbers or range(1, len(document) + 1)
+            for number in numbers:
+                page = document[number - 1]
+                if engine == "pdfium":
+                    bitmap = page.render(scale=self.dpi / 72, grayscale=True)
+                    image = bitmap.to_numpy().squeeze()
+                    page.close()
+                else:
+                    pixmap = page.get_pixmap(dpi=self.dpi, colorspace=fitz.csGRAY)
+                    image = np.frombuffer(pixmap.samples, np.uint8).reshape(
+                        pixmap.height, pixmap.stride
+                    )[:, : pixmap.width]
+                yield number, image
+        finally:
+            document.close()
+
+    def _frame_pages_(self, numbers):
+        import numpy as np
+        from PIL import Image
+
+        # Frames are decoded on seek, only the current one is held in memory
+        with Image.open(self.path) as image:
+            numbers = numbers or range(1, getattr(image, "n_frames", 1) + 1)
+            for number in numbers:
+                image.seek(number - 1)
+                yield number, np.asarray(image.convert("L"))
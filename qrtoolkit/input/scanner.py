@@ -0,0 +1,107 @@
+import fnmatch
+import os
+
+IMAGE_EXTENSIONS = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".bmp",
+    ".tif",
+    ".tiff",
+    ".webp",
+    ".gif",
+    ".pdf",
+)
+
+# Leading bytes of the raster and document formats the decoder can read
+IMAGE_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",
+    b"BM",
+    b"II*\x00",
+    b"MM\x00*",
+    b"GIF8",
+    b"%PDF-",
+)
+
+
+class DirectoryScanner:
+    """
+    Lazily walk a directory with os.scandir, yielding image paths as they
+    are found so decoding can start before the walk finishes.
+    """
+
+    def __init__(
+        self, root, recursive=False, include=None, exclude=None, sniff=False
+    ):
+        self.root = root
+        self.recursive = recursive
+        self.include = include or []
+        self.exclude = exclude or []
+        self.sniff = sniff
+
+    @staticmethod
+    def sniff_image(path):
+        """Detect an image by its leading bytes rather than its extension"""
+        try:
+            with open(path, "rb") as f:
+                head = f.read(12)
+        except OSError:
+            return False
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return True
+        return head.startswith(IMAGE_SIGNATURES)
+
+    @staticmethod
+    def _matches_(patterns, name, rel_path):
+        return any(
+            fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern)
+            for pattern in patterns
+        )
+
+    def selects(self, name, rel_path):
+        """Apply include/exclude globs, then the extension check unless sniffing"""
+        if self._matches_(self.exclude, name, rel_path):
+            return False
+        if self.include:
+            return self._matches_(self.include, name, rel_path)
+        return self.sniff or name.lower().endswith(IMAGE_EXTENSIONS)
+
+    def is_image(self, entry, rel_path):
+        """Apply include/exclude globs, then the extension or content check"""
+        if not self.selects(entry.name, rel_path):
+            return False
+        return not self.sniff or self.sniff_image(entry.path)
+
+    def selects_path(self, path):
+        """Name and glob check for a file path below root, without reading it"""
+        return self.selects(os.path.basename(path), os.path.relpath(path, self.root))
+
+    def descends(self, path):
+        """Whether a subdirectory of root is walked"""
+        return self.recursive and not self._matches_(
+            self.exclude, os.path.basename(path), os.path.relpath(path, self.root)
+        )
+
+    def scan(self):
+        """Yield image paths below root"""
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        rel_path = os.path.relpath(entry.path, self.root)
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.descends(entry.path):
+                                    pending.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                        except OSError:
+                            continue
+                        if self.is_image(entry, rel_path):
+                            yield entry.path
+            except (PermissionError, FileNotFoundError):
+                continue
@@ -0,0 +1,356 @@
+"""
+Watch a directory for new or rewritten images.
+
+On Linux the kernel's inotify API is used directly through ctypes. Files are
+reported once they are closed after writing or renamed into place, and then
+only after a short settle delay with no further change. Where inotify is not
+available, or the directory is on a network filesystem whose remote writes
+inotify never sees, the tree is polled and compared by size and mtime.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import time
+
+from .scanner import DirectoryScanner
+
+# inotify event bits, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+_EVENT = struct.Struct("iIII")
+
+# Filesystems where changes made by other hosts produce no inotify events
+REMOTE_FILESYSTEMS = (
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smb3",
+    "smbfs",
+    "9p",
+    "ceph",
+    "glusterfs",
+    "fuse.sshfs",
+    "fuse.rclone",
+)
+
+# Change kinds reported by the backends
+SETTLING, CLOSED, REMOVED, NEW_DIR, OVERFLOW = range(5)
+
+
+def _libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def filesystem_type(path):
+    """Type of the filesystem holding path, from the longest matching mount"""
+    path = os.path.realpath(path)
+    best, fs_type = "", None
+    try:
+        with open("/proc/self/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # Spaces and tabs in mount points are octal-escaped
+                mount_point = re.sub(
+                    r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1]
+                )
+                if len(mount_point) > len(best) and (
+                    path == mount_point
+                    or path.startswith(mount_point.rstrip("/") + "/")
+                ):
+                    best, fs_type = mount_point, fields[2]
+    except OSError:
+        return None
+    return fs_type
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class InotifyBackend:
+    """Directory watches on one non-blocking inotify descriptor"""
+
+    MASK = (
+        IN_MODIFY
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_ONLYDIR
+    )
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = _libc()
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        self.directories = {}
+
+    def add(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch: {os.strerror(errno)}", directory)
+        self.directories[wd] = directory
+
+    def read(self, timeout):
+        """Return (path, kind) changes, waiting up to timeout seconds for one"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        changes = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changes.append((None, OVERFLOW))
+                continue
+            if mask & IN_IGNORED:
+                # Watched directory was removed
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changes.append((path, NEW_DIR))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changes.append((path, CLOSED))
+            elif mask & (IN_CREATE | IN_MODIFY):
+                changes.append((path, SETTLING))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                changes.append((path, REMOVED))
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Periodic scans of the tree, compared by file size and mtime"""
+
+    def __init__(self, scanner, interval=1.0):
+        self.scanner = scanner
+        self.interval = interval
+        self.files = self.snapshot()
+        self.next_poll = time.monotonic() + interval
+
+    def snapshot(self):
+        files = {}
+        for path in self.scanner.scan():
+            signature = _signature(path)
+            if signature is not None:
+                files[path] = signature
+        return files
+
+    def read(self, timeout):
+        wait = self.next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(0.0, wait))
+        files = self.snapshot()
+        self.next_poll = time.monotonic() + self.interval
+
+        changes = [
+            (path, CLOSED)
+            for path, signature in files.items()
+            if self.files.get(path) != signature
+        ]
+        changes += [(path, REMOVED) for path in self.files.keys() - files.keys()]
+        self.files = files
+        return changes
+
+    def close(self):
+        pass
+
+
+class DirectoryWatcher:
+    """
+    Yield image paths below a directory as they are written.
+    A file is reported once it has gone `settle` seconds without changing
+    after being closed or renamed into place, and again only if its size
+    or mtime change later on.
+    """
+
+    def __init__(
+        self,
+        root,
+        recursive=False,
+        include=None,
+        exclude=None,
+        sniff=False,
+        settle=0.1,
+        poll=None,
+        existing=False,
+    ):
+        self.root = root
+        self.scanner = DirectoryScanner(root, recursive, include, exclude, sniff)
+        self.settle = settle
+        # Writers that never close the file (or are still writing) must go quiet
+        self.idle = max(1.0, settle * 10)
+        self.poll = poll
+        self.existing = existing
+        self.backend = None
+        # Why inotify could not be used, when polling was not asked for
+        self.fallback = None
+        self.pending = {}
+        self.reported = {}
+
+    def _backend_(self):
+        if self.poll is None:
+            fs_type = filesystem_type(self.root)
+            if fs_type in REMOTE_FILESYSTEMS:
+                self.fallback = f"{fs_type} filesystem"
+            else:
+                try:
+                    backend = InotifyBackend()
+                except OSError as e:
+                    self.fallback = str(e)
+                else:
+                    try:
+                        self._add_tree_(backend, self.root)
+                        return backend
+                    except OSError as e:
+                        backend.close()
+                        self.fallback = str(e)
+        return PollingBackend(self.scanner, self.poll or 1.0)
+
+    def _walk_(self, directory):
+        """Yield (directory, file names) for directory and the subdirectories walked"""
+        for current, subdirs, files in os.walk(directory):
+            subdirs[:] = [
+                name
+                for name in subdirs
+                if self.scanner.descends(os.path.join(current, name))
+            ]
+            yield current, files
+
+    def _add_tree_(self, backend, directory):
+        """Watch directory and, when recursive, every subdirectory below it"""
+        for current, _ in self._walk_(directory):
+            backend.add(current)
+
+    @property
+    def mode(self):
+        if self.backend is None:
+            return None
+        return "inotify" if isinstance(self.backend, InotifyBackend) else "poll"
+
+    def _queue_(self, path, delay, now):
+        entry = self.pending.get(path)
+        if entry is None:
+            # detected time is kept so latency covers the whole settle wait
+            self.pending[path] = [now + delay, _signature(path), now]
+        else:
+            entry[0] = now + delay
+            entry[1] = _signature(path)
+
+    def _handle_(self, path, kind, now):
+        if kind == OVERFLOW:
+            # Events were lost: compare everything against what was reported
+            for image in self.scanner.scan():
+                if _signature(image) != self.reported.get(image):
+                    self._queue_(image, self.settle, now)
+        elif kind == NEW_DIR:
+            if self.scanner.descends(path):
+                try:
+                    self._add_tree_(self.backend, path)
+                except OSError:
+                    return
+                # Files written before the watch was in place
+                for current, files in self._walk_(path):
+                    for name in files:
+                        image = os.path.join(current, name)
+                        if self.scanner.selects_path(image):
+                            self._queue_(image, self.idle, now)
+        elif kind == REMOVED:
+            self.pending.pop(path, None)
+            self.reported.pop(path, None)
+        elif self.scanner.selects_path(path):
+            self._queue_(path, self.settle if kind == CLOSED else self.idle, now)
+
+    def _settled_(self, now):
+        due = [path for path, entry in self.pending.items() if entry[0] <= now]
+        for path in due:
+            deadline, signature, detected = self.pending[path]
+            current = _signature(path)
+            if current is None:
+                del self.pending[path]
+            elif current != signature:
+                # Still being written
+                self.pending[path] = [now + self.settle, current, detected]
+            else:
+                del self.pending[path]
+                if current == self.reported.get(path):
+                    continue
+                if self.scanner.sniff and not self.scanner.sniff_image(path):
+                    continue
+                self.reported[path] = current
+                yield path, detected
+
+    def start(self):
+        """Set up inotify watches, or the polling baseline, and return the mode"""
+        if self.backend is None:
+            self.backend = self._backend_()
+        return self.mode
+
+    def watch(self, stop=None):
+        """Yield (path, detected) until stop is set; detected is a perf_counter time"""
+        self.start()
+        try:
+            if self.existing:
+                now = time.perf_counter()
+                for path in self.scanner.scan():
+                    self._queue_(path, 0.0, now)
+
+            while stop is None or not stop.is_set():
+                timeout = 0.25
+                if self.pending:
+                    earliest = min(entry[0] for entry in self.pending.values())
+                    timeout = min(timeout, max(0.0, earliest - time.perf_counter()))
+                for path, kind in self.backend.read(timeout):
+                    self._handle_(path, kind, time.perf_counter())
+                yield from self._settled_(time.perf_counter())
+        finally:
+            self.backend.close()
@@ -1,6 +1,7 @@
 import json
 import os
 from datetime import datetime
+from ..core.migration import MigrationError
 from ..core.processor import DataProcessor
 
 
@@ -14,10 +15,14 @@ class JSONHandler:
         data = {"version": 1, "generated": datetime.now().isoformat(), "entries": []}
 
         for secret in secrets:
-            parsed = DataProcessor.parse_2fa_url(secret)
+            try:
+                # Migration exports expand to every account they hold; parse
+                # them all first so a malformed export adds none of them
+                entries = list(DataProcessor.parse_2fa_entries(secret))
+            except MigrationError:
+                continue
             # Only add valid 2FA entries
-            if parsed.get("secret"):
-                data["entries"].append(parsed)
+            data["entries"].extend(parsed for parsed in entries if parsed.get("secret"))
 
         # Only create file if we have valid entries
         if data["entries"]:
@@ -0,0 +1,51 @@
+import json
+import sys
+import time
+
+
+class NDJSONWriter:
+    """
+    Stream one JSON record per line as results are produced.
+    Writes are buffered and flushed every flush_every records or
+    flush_interval seconds, whichever comes first.
+    """
+
+    def __init__(self, output_file=None, flush_every=256, flush_interval=1.0):
+        if output_file in (None, "-"):
+            self.stream = sys.stdout
+            self.owned = False
+        else:
+            self.stream = open(output_file, "a", buffering=1 << 16, encoding="utf-8")
+            self.owned = True
+        self.output_file = output_file or "-"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self.written = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.pending += 1
+        self.written += 1
+        if (
+            self.pending >= self.flush_every
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        self.stream.flush()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self.owned:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,309 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from ..core.processor import DataProcessor, PayloadClassifier
+from ..utils.colors import foreground
+
+fg = foreground()
+RESET = fg.RESET
+
+
+def default_store_path():
+    """Location of the result store, following XDG_DATA_HOME when set"""
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(base, "qrtoolkit", "results.sqlite3")
+
+
+def _prefix_range_(prefix):
+    """Bounds of every string starting with prefix, so the lookup uses an index"""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ResultStore:
+    """
+    Persistent index of decoded payloads and the sources they were seen in.
+    Payloads are stored once per content hash, tagged with their kind (url,
+    wifi, ...); every (payload, source) pair keeps its first and last
+    sighting. Writes are buffered and committed in batches inside one
+    transaction.
+    """
+
+    def __init__(self, path=None, batch_size=500):
+        self.path = path or default_store_path()
+        self.batch_size = batch_size
+        self.pending = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Index pages for millions of rows stay in memory during batch inserts
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS payloads (
+                id INTEGER PRIMARY KEY,
+                hash BLOB NOT NULL UNIQUE,
+                data TEXT NOT NULL,
+                type TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sightings (
+                payload_id INTEGER NOT NULL REFERENCES payloads (id),
+                source TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (payload_id, source)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS payloads_data ON payloads (data);
+            CREATE INDEX IF NOT EXISTS sightings_source ON sightings (source);
+            CREATE INDEX IF NOT EXISTS sightings_last_seen ON sightings (last_seen);
+            """)
+        self._migrate_()
+        # Nearly every symbol is a QRCODE, so an index on type never helps
+        self.conn.executescript("""
+            DROP INDEX IF EXISTS payloads_type;
+            CREATE INDEX IF NOT EXISTS payloads_kind ON payloads (kind);
+            """)
+
+    def _migrate_(self):
+        """Add and fill the kind column in stores created before it existed"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(payloads)")}
+        if "kind" in columns:
+            return
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.execute(
+                "ALTER TABLE payloads ADD COLUMN kind TEXT NOT NULL DEFAULT 'text'"
+            )
+            self.conn.executemany(
+                "UPDATE payloads SET kind = ? WHERE id = ?",
+                [
+                    (DataProcessor.classify(data), _id)
+                    for _id, data in self.conn.execute("SELECT id, data FROM payloads")
+                ],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def payload_hash(data, _type):
+        return hashlib.blake2b(
+            f"{_type}\0{data}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def add(self, source, results):
+        """Queue the results decoded from one source"""
+        now = time.time()
+        if source not in ("-", "camera", "screen"):
+            source = os.path.abspath(source)
+        for result in results:
+            self.pending.append(
+                (
+                    source,
+                    result["data"],
+                    result["type"],
+                    DataProcessor.result_kind(result),
+                    now,
+                )
+            )
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write queued results in a single transaction"""
+        if not self.pending:
+            return
+        self.conn.execute("BEGIN")
+        try:
+            rows = [
+                (self.payload_hash(data, _type), data, _type, kind, source, seen)
+                for source, data, _type, kind, seen in self.pending
+            ]
+            self.conn.executemany(
+                "INSERT INTO payloads (hash, data, type, kind, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (hash) DO UPDATE SET last_seen = excluded.last_seen",
+                [
+                    (h, data, _type, kind, seen, seen)
+                    for h, data, _type, kind, _, seen in rows
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO sightings (payload_id, source, first_seen, last_seen) "
+                "SELECT id, ?, ?, ? FROM payloads WHERE hash = ? "
+                "ON CONFLICT (payload_id, source) "
+                "DO UPDATE SET last_seen = excluded.last_seen",
+                [(source, seen, seen, h) for h, _, _, _, source, seen in rows],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.pending.clear()
+
+    def query(
+        self,
+        data=None,
+        prefix=None,
+        source=None,
+        _type=None,
+        kind=None,
+        since=None,
+        limit=100,
+    ):
+        """Return matching sightings, most recent first"""
+        where, params = [], []
+        if data is not None:
+            where.append("p.data = ?")
+            params.append(data)
+        if prefix:
+            where.append("p.data >= ? AND p.data < ?")
+            params += _prefix_range_(prefix)
+        if source:
+            source = os.path.abspath(source)
+            if os.path.isdir(source):
+                where.append("s.source >= ? AND s.source < ?")
+                params += _prefix_range_(os.path.join(source, ""))
+            else:
+                where.append("s.source = ?")
+                params.append(source)
+        if _type:
+            where.append("p.type = ?")
+            params.append(_type)
+        if kind:
+            where.append("p.kind = ?")
+            params.append(kind)
+        if since is not None:
+            where.append("s.last_seen >= ?")
+            params.append(since)
+
+        sql = (
+            "SELECT p.data, p.type, p.kind, s.source, s.first_seen, s.last_seen "
+            "FROM sightings s JOIN payloads p ON p.id = s.payload_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY s.last_seen DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "data": data,
+                "type": _type,
+                "kind": kind,
+                "source": source,
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+            }
+            for data, _type, kind, source, first_seen, last_seen in self.conn.execute(
+                sql, params
+            )
+        ]
+
+    def counts(self):
+        (payloads,) = self.conn.execute("SELECT COUNT(*) FROM payloads").fetchone()
+        (sightings,) = self.conn.execute("SELECT COUNT(*) FROM sightings").fetchone()
+        (sources,) = self.conn.execute(
+            "SELECT COUNT(DISTINCT source) FROM sightings"
+        ).fetchone()
+        return {"payloads": payloads, "sightings": sightings, "sources": sources}
+
+    def close(self):
+        self.flush()
+        # Refresh planner statistics so low-selectivity indexes are skipped
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _since_(value):
+    """Parse an ISO date/time, or a relative age such as 30m, 12h or 7d"""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1:] in units and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool query", description="Look up decoded payloads in the result store"
+    )
+    parser.add_argument("data", nargs="?", help="Exact payload to look up")
+    parser.add_argument(
+        "--store", help=f"Result store (default: {default_store_path()})"
+    )
+    parser.add_argument("--prefix", help="Payloads starting with PREFIX")
+    parser.add_argument(
+        "--source", help="Codes seen in this file, or in any file under this directory"
+    )
+    parser.add_argument("--type", help="Symbology, e.g. QRCODE")
+    parser.add_argument(
+        "--kind",
+        choices=PayloadClassifier.KINDS,
+        help="Payload kind, e.g. url, wifi or otpauth",
+    )
+    parser.add_argument(
+        "--since", type=_since_, help="Seen since an ISO date or an age (30m, 12h, 7d)"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=100, help="Maximum rows (default: 100)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print rows as NDJSON")
+    parser.add_argument("--stats", action="store_true", help="Print store counts")
+    args = parser.parse_args(argv)
+
+    path = args.store or default_store_path()
+    if not os.path.exists(path):
+        print(f"Error: result store not found: {path}", file=sys.stderr)
+        return 1
+
+    with ResultStore(path) as store:
+        if args.stats:
+            print(json.dumps(store.counts(), indent=2))
+            if not any(
+                [args.data, args.prefix, args.source, args.type, args.kind, args.since]
+            ):
+                return 0
+
+        started = time.perf_counter()
+        rows = store.query(
+            data=args.data,
+            prefix=args.prefix,
+            source=args.source,
+            _type=args.type,
+            kind=args.kind,
+            since=args.since,
+            limit=args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for row in rows:
+        if args.json:
+            print(json.dumps(row))
+            continue
+        last_seen = datetime.fromtimestamp(row["last_seen"]).isoformat(
+            sep=" ", timespec="seconds"
+        )
+        print(
+            f"{fg.GREEN_FG}{row['data']}{RESET}  {fg.BLUE_FG}{row['source']}{RESET}  "
+            f"{last_seen}"
+        )
+    print(f"{len(rows)} rows in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0 if rows else 1
@@ -0,0 +1,116 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+
+from ..utils.colors import foreground
+
+fg = foreground()
+RESET = fg.RESET
+
+DEFAULT_PORT = 8765
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix-domain socket"""
+
+    def __init__(self, socket_path, timeout=60):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DecodeClient:
+    """Talk to a running `qrtool serve` over one kept-alive connection"""
+
+    def __init__(self, socket_path=None, host="127.0.0.1", port=DEFAULT_PORT):
+        if socket_path:
+            self.conn = UnixHTTPConnection(socket_path)
+        else:
+            self.conn = http.client.HTTPConnection(host, port, timeout=60)
+
+    def _request_(self, method, path, body=None, content_type=None):
+        headers = {"Content-Type": content_type} if content_type else {}
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        payload = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(payload.get("error", f"HTTP {response.status}"))
+        return payload
+
+    def decode_bytes(self, data):
+        return self._request_("POST", "/decode", data, "application/octet-stream")
+
+    def decode_paths(self, paths):
+        body = json.dumps({"paths": [os.path.abspath(path) for path in paths]})
+        return self._request_("POST", "/decode", body, "application/json")
+
+    def stats(self):
+        return self._request_("GET", "/stats")
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool client", description="Decode images through `qrtool serve`"
+    )
+    parser.add_argument("inputs", nargs="*", help="Input image files")
+    parser.add_argument("--socket", help="Unix-domain socket of the server")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Server port")
+    parser.add_argument(
+        "--by-path",
+        action="store_true",
+        help="Send paths in one batch request instead of uploading file bytes",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the raw JSON responses"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="Print server queue and latency stats"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.stats:
+        parser.error("Please specify input files or --stats")
+
+    client = DecodeClient(args.socket, args.host, args.port)
+    try:
+        if args.by_path and args.inputs:
+            files = client.decode_paths(args.inputs)["files"]
+        else:
+            files = []
+            for path in args.inputs:
+                with open(path, "rb") as f:
+                    files.append({"path": path, **client.decode_bytes(f.read())})
+
+        status = 0
+        for entry in files:
+            if args.json:
+                print(json.dumps(entry))
+                continue
+            if entry["error"]:
+                status = 1
+                print(
+                    f"{entry['path']}: {fg.RED_FG}{entry['error']}{RESET}",
+                    file=sys.stderr,
+                )
+            for result in entry["results"]:
+                print(f"{entry['path']}: {fg.GREEN_FG}{result['data']}{RESET}")
+
+        if args.stats:
+            print(json.dumps(client.stats(), indent=2))
+        return status
+    except (ConnectionError, FileNotFoundError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
@@ -0,0 +1,369 @@
+import argparse
+import ipaddress
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .client import DEFAULT_PORT
+from ..core import batch
+from ..core.backends import BACKENDS
+from ..utils.colors import foreground
+from ..utils.loger import get_logger
+from ..utils.stats import percentile
+
+logger = get_logger()
+
+fg = foreground()
+RESET = fg.RESET
+
+# Largest request body read into memory, unless --max-body says otherwise
+DEFAULT_MAX_BODY = 32 << 20
+
+
+class DecodeService:
+    """
+    Warm pool of decoder processes shared by every client connection.
+    Tracks in-flight tasks and recent request latencies, and replaces the
+    pool when a worker process dies.
+    """
+
+    def __init__(self, workers=None, chunksize=16, decoder_options=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.decoder_options = decoder_options or {}
+        self.pool = self._new_pool_()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.images = 0
+        self.errors = 0
+        self.restarts = 0
+        self.latencies = deque(maxlen=2048)
+        self.started = time.monotonic()
+
+    def _new_pool_(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=batch._init_worker,
+            initargs=(self.decoder_options,),
+        )
+
+    def _restart_(self, broken):
+        """Swap in a fresh pool, once, for requests that hit the broken one"""
+        with self.lock:
+            if self.pool is not broken:
+                return
+            self.pool = self._new_pool_()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("A decoder process died, the worker pool was restarted")
+
+    def warm(self):
+        """Start every worker (and its decoder) before the first request"""
+        futures = [self.pool.submit(batch._warm_worker) for _ in range(self.workers)]
+        return {future.result() for future in futures}
+
+    def _submit_(self, pool, fn, *args):
+        with self.lock:
+            self.in_flight += 1
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException:
+            self._finished_(None)
+            raise
+        future.add_done_callback(self._finished_)
+        return future
+
+    def _finished_(self, _future):
+        with self.lock:
+            self.in_flight -= 1
+
+    def _record_(self, started, images, errors):
+        with self.lock:
+            self.requests += 1
+            self.images += images
+            self.errors += errors
+            self.latencies.append((time.monotonic() - started) * 1000)
+
+    def _failed_(self, started, images, pool):
+        """Count a request lost to a dead worker and restart the pool"""
+        self._record_(started, images, images)
+        self._restart_(pool)
+
+    def decode_bytes(self, data):
+        started = time.monotonic()
+        pool = self.pool
+        try:
+            results, error = self._submit_(pool, batch._decode_buffer, data).result()
+        except BrokenProcessPool:
+            self._failed_(started, 1, pool)
+            raise
+        self._record_(started, 1, bool(error))
+        return {"results": [result.to_dict() for result in results], "error": error}
+
+    def decode_paths(self, paths):
+        """Decode a batch of files, split in chunks across the pool"""
+        started = time.monotonic()
+        pool = self.pool
+        try:
+            futures = [
+                self._submit_(pool, batch._decode_chunk, paths[i : i + self.chunksize])
+                for i in range(0, len(paths), self.chunksize)
+            ]
+            chunks = [future.result()[0] for future in futures]
+        except BrokenProcessPool:
+            self._failed_(started, len(paths), pool)
+            raise
+        files = []
+        for chunk in chunks:
+            files.extend(
+                {
+                    "path": path,
+                    "results": [result.to_dict() for result in results],
+                    "error": error,
+                    "elapsed_ms": seconds * 1000,
+                }
+                for path, results, error, seconds in chunk
+            )
+        self._record_(started, len(files), sum(bool(f["error"]) for f in files))
+        return {"files": files}
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                "workers": self.workers,
+                "queue_depth": self.in_flight,
+                "requests": self.requests,
+                "images": self.images,
+                "errors": self.errors,
+                "restarts": self.restarts,
+                "uptime_s": time.monotonic() - self.started,
+                "latency_ms": {
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99),
+                },
+            }
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class DecodeRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /decode  raw image bytes, or JSON {"paths": [...]} for a batch
+    GET  /stats   queue depth and latency percentiles
+    GET  /health  liveness probe
+    Path batches make the daemon open files itself, so they are refused
+    unless the server only listens locally (see make_server).
+    """
+
+    server_version = "qrtool"
+    protocol_version = "HTTP/1.1"
+
+    def _send_json_(self, status, payload, close=False):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            # The unread request body would be parsed as the next request
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._send_json_(200, self.server.service.stats())
+        if self.path == "/health":
+            return self._send_json_(200, {"status": "ok"})
+        self._send_json_(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/decode":
+            return self._send_json_(404, {"error": f"Unknown endpoint: {self.path}"})
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return self._send_json_(400, {"error": "Invalid Content-Length"}, True)
+        if length <= 0:
+            return self._send_json_(400, {"error": "Empty request body"}, True)
+        if length > self.server.max_body:
+            return self._send_json_(
+                413,
+                {"error": f"Request body over {self.server.max_body} bytes"},
+                True,
+            )
+        is_json = self.headers.get("Content-Type", "").startswith("application/json")
+        if is_json and not self.server.allow_paths:
+            return self._send_json_(
+                403,
+                {"error": "Path batches are only served on local addresses"},
+                True,
+            )
+        body = self.rfile.read(length)
+
+        if is_json:
+            try:
+                paths = json.loads(body)["paths"]
+            except (ValueError, KeyError, TypeError):
+                paths = None
+            if not isinstance(paths, list) or not all(
+                isinstance(path, str) for path in paths
+            ):
+                return self._send_json_(
+                    400, {"error": 'Expected a JSON object with a "paths" list'}
+                )
+            decode, payload = self.server.service.decode_paths, paths
+        else:
+            decode, payload = self.server.service.decode_bytes, body
+
+        try:
+            response = decode(payload)
+        except BrokenProcessPool:
+            return self._send_json_(
+                500, {"error": "A decoder process died, please retry the request"}
+            )
+        self._send_json_(200, response)
+
+    def address_string(self):
+        # Unix socket peers have no host address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        # Only the owner may connect; the umask covers the gap before chmod
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+        # Attributes BaseHTTPRequestHandler expects from HTTPServer
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def is_local(server):
+    """Whether only this machine can connect: a Unix socket or a loopback address"""
+    if isinstance(server, UnixHTTPServer):
+        return True
+    return ipaddress.ip_address(server.server_address[0]).is_loopback
+
+
+def make_server(
+    service,
+    socket_path=None,
+    host="127.0.0.1",
+    port=DEFAULT_PORT,
+    max_body=DEFAULT_MAX_BODY,
+):
+    if socket_path:
+        server = UnixHTTPServer(socket_path, DecodeRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), DecodeRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = False
+    server.max_body = max_body
+    # Remote clients could read any file the daemon can through path batches
+    server.allow_paths = is_local(server)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="qrtool serve",
+        description="Serve QR decoding from a warm worker pool over HTTP",
+    )
+    parser.add_argument("--socket", help="Listen on this Unix-domain socket")
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"TCP port (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Decoder processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=16, help="Paths per task in batch requests"
+    )
+    parser.add_argument(
+        "--backend",
+        default="pyzbar",
+        help=f"Comma-separated decoder backends ({', '.join(BACKENDS)})",
+    )
+    parser.add_argument(
+        "--max-body",
+        type=int,
+        default=DEFAULT_MAX_BODY >> 20,
+        metavar="MB",
+        help=f"Reject request bodies over MB megabytes (default: {DEFAULT_MAX_BODY >> 20})",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    backends = tuple(name for name in args.backend.split(",") if name)
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown or not backends:
+        parser.error(f"Unknown decoder backend(s): {', '.join(unknown)}")
+    if args.max_body < 1:
+        parser.error("--max-body must be at least 1 MB")
+
+    service = DecodeService(
+        workers=args.workers,
+        chunksize=args.chunksize,
+        decoder_options={"backends": backends},
+    )
+    service.warm()
+    server = make_server(
+        service, args.socket, args.host, args.port, max_body=args.max_body << 20
+    )
+    server.verbose = args.verbose
+    if not server.allow_paths:
+        logger.warning(
+            f"{args.host} is not a loopback address, "
+            "path batches are refused and only uploaded images are decoded"
+        )
+
+    where = args.socket or f"http://{args.host}:{server.server_port}"
+    logger.info(
+        f"Serving with {service.workers} warm workers on {fg.BLUE_FG}{where}{RESET}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    # Multiplying first keeps whole ranks exact, 95 / 100 * 20 is not 19.0
+    rank = math.ceil(pct * len(sorted_values) / 100)
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
@@ -32,7 +32,11 @@ setup(
         "pyzbar",
         "Pillow",
         "pyperclip",
+        "tqdm",
     ],
+    extras_require={
+        "pdf": ["pypdfium2"],
+    },
     include_package_data=True,
     package_data={
         # 'pkg': ['dirname/**', 'config.json'],
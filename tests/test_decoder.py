@@ -0,0 +1,32 @@
+import cv2
+import numpy as np
+import pytest
+
+from qrtoolkit.core.decoder import QRDecoder
+
+
+@pytest.fixture
+def qr_image(tmp_path):
+    """A code with 6 pixel modules on a white page, readable at half size"""
+    code = cv2.QRCodeEncoder.create().encode("https://example.com/pyramid")
+    side = code.shape[0] * 6
+    code = cv2.resize(code, (side, side), interpolation=cv2.INTER_NEAREST)
+    page = np.full((1000, 1200), 255, np.uint8)
+    page[300 : 300 + side, 500 : 500 + side] = code
+    path = tmp_path / "page.png"
+    cv2.imwrite(str(path), page)
+    return str(path)
+
+
+def test_pyramid_geometry_is_in_full_image_pixels(qr_image):
+    (full,) = QRDecoder(backends=("opencv",)).decode_from_image(qr_image)
+    decoder = QRDecoder(backends=("opencv",), pyramid=(2,))
+    (reduced,) = decoder.decode_from_image(qr_image)
+
+    assert reduced.scale == 2
+    assert reduced.text == full.text
+    # One reduced pixel is two full ones, allow for that rounding
+    for a, b in zip(full.rect, reduced.rect):
+        assert abs(a - b) <= 4
+    for (ax, ay), (bx, by) in zip(full.polygon, reduced.polygon):
+        assert abs(ax - bx) <= 4 and abs(ay - by) <= 4
@@ -0,0 +1,46 @@
+import base64
+import json
+import urllib.parse
+
+from qrtoolkit.outputs.json_handler import JSONHandler
+
+
+def _field(number, payload):
+    """Length-delimited protobuf field, payloads here stay under 128 bytes"""
+    return bytes([number << 3 | 2, len(payload)]) + payload
+
+
+def _payload(*names):
+    """MigrationPayload with one OtpParameters (secret, name) per account"""
+    return b"".join(
+        _field(1, _field(1, b"secret-" + name) + _field(2, name)) for name in names
+    )
+
+
+def _url(payload):
+    data = urllib.parse.quote(base64.b64encode(payload).decode("ascii"))
+    return f"otpauth-migration://offline?data={data}"
+
+
+def test_truncated_migration_export_adds_no_accounts(tmp_path):
+    payload = _payload(b"alice", b"bob")
+    # Cut into the second account, after the first one parsed cleanly
+    truncated = _url(payload[:-3])
+    output = tmp_path / "backup.json"
+
+    assert JSONHandler.save_2fa_secrets([truncated], str(output)) is None
+    assert not output.exists()
+
+    totp = "otpauth://totp/S:carol?secret=JBSWY3DPEHPK3PXP&issuer=S"
+    assert JSONHandler.save_2fa_secrets([truncated, totp], str(output))
+    entries = json.loads(output.read_text())["entries"]
+    assert [entry["secret"] for entry in entries] == ["JBSWY3DPEHPK3PXP"]
+
+
+def test_migration_export_adds_every_account(tmp_path):
+    output = tmp_path / "backup.json"
+    url = _url(_payload(b"alice", b"bob"))
+
+    assert JSONHandler.save_2fa_secrets([url], str(output))
+    entries = json.loads(output.read_text())["entries"]
+    assert [entry["label"] for entry in entries] == ["alice", "bob"]
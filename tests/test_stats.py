@@ -0,0 +1,22 @@
+from qrtoolkit.utils.stats import percentile
+
+
+def test_percentile_odd_length():
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+    assert percentile(values, 100) == 5
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+    # ceil(0.95 * 20) = 19, not 20 through float rounding
+    assert percentile(values, 95) == 19
+    assert percentile(values, 50) == 10
+    assert percentile(values, 99) == 20
+    assert percentile([7], 50) == 7
+
+
+def test_percentile_empty():
+    assert percentile([], 50) is None